@@ -1,15 +1,20 @@
 # backend/app/auth/token.py
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from app.config import settings
+from app.utils.log import get_logger
 # app/auth/utils.py 또는 적절한 위치에 작성
 
 from sqlalchemy.orm import Session
 from app.models.user import User
-from app.models.follow import Follow
+from app.utils.follow_graph import mutual_follows_query
+
+logger = get_logger(__name__)
 
 
 
@@ -22,6 +27,42 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHasherPool:
+    """
+    bcrypt 를 이벤트 루프 밖의 전용 스레드에서 실행한다.
+    실행 중 + 대기 중인 작업이 workers + max_queue 를 넘으면 바로 503 을 돌려준다 (load shedding).
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.capacity = workers + max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._in_flight = 0
+
+    async def run(self, func, *args):
+        if self._in_flight >= self.capacity:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="요청이 많아 잠시 후 다시 시도해 주세요.",
+                headers={"Retry-After": "1"},
+            )
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_flight -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHasherPool(settings.password_hash_workers, settings.password_hash_max_queue)
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: dict) -> str:
     """JWT 액세스 토큰 생성"""
     to_encode = data.copy()
@@ -34,10 +75,10 @@ def create_access_token(data: dict) -> str:
             settings.JWT_SECRET_KEY,
             algorithm=settings.JWT_ALGORITHM
         )
-        print("✅ 생성된 JWT:", encoded_jwt)  # ✅ 이 위치로 이동
+        logger.debug("JWT 발급", extra={"category": "auth", "user_id": data.get("user_id")})
         return encoded_jwt
     except Exception as e:
-        print(f"❌ JWT 생성 오류: {str(e)}")
+        logger.exception("JWT 생성 오류", extra={"category": "auth", "error": str(e)})
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="토큰 생성 중 오류가 발생했습니다."
@@ -60,7 +101,7 @@ def verify_token(token: str) -> int:
             )
         return user_id
     except JWTError as e:
-        print(f"❌ JWT 검증 실패: {str(e)}")
+        logger.info("JWT 검증 실패", extra={"category": "auth", "error": str(e)})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="인증 정보가 만료되었거나 유효하지 않습니다",
@@ -71,12 +112,4 @@ def get_friends(db: Session, user_id: int) -> list[User]:
     """
     상호 팔로우 관계인 친구 리스트 반환
     """
-    # 내가 팔로우한 사람들
-    following = db.query(Follow.followed_id).filter(Follow.follower_id == user_id).subquery()
-
-    # 나를 팔로우한 사람들 중, 내가 팔로우한 사람만 = 친구
-    friend_users = db.query(User).join(Follow, Follow.follower_id == User.id)\
-        .filter(Follow.followed_id == user_id)\
-        .filter(User.id.in_(following)).all()
-
-    return friend_users
\ No newline at end of file
+    return mutual_follows_query(db, user_id).all()
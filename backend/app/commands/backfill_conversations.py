@@ -0,0 +1,29 @@
+# app/commands/backfill_conversations.py
+"""
+messages 로 conversations 테이블을 다시 채우는 백필/복구 명령.
+
+    alembic upgrade head      # 테이블 생성 (새로 만들 때 한 번 채운다)
+    python -m app.commands.backfill_conversations
+
+한 트랜잭션 안에서 conversations 를 비우고 다시 만들기 때문에 여러 번 실행해도 된다.
+"""
+from app.database import SessionLocal
+from app.utils.conversations import rebuild_conversations
+import app.models.profile_customization  # noqa: F401  User 관계 설정에 필요
+
+
+def main():
+    db = SessionLocal()
+    try:
+        count = rebuild_conversations(db)
+        db.commit()
+        print(f"✅ conversations 백필 완료: {count}개 대화방")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# app/commands/check_query_plans.py
+"""
+자주 실행되는 쿼리의 실행 계획을 확인하는 명령 (CI / 마이그레이션 후 점검용).
+
+    alembic upgrade head
+    python -m app.commands.check_query_plans
+
+각 쿼리에 EXPLAIN 을 실행해서 인덱스 없이 테이블 전체를 읽는 쿼리가 있으면 목록을 출력하고
+종료 코드 1 로 끝난다.
+
+- MySQL: type=ALL 이면서 possible_keys 가 비어 있는 행 (쓸 수 있는 인덱스 자체가 없음)
+  데이터가 적으면 옵티마이저가 인덱스가 있어도 ALL 을 고를 수 있어서 possible_keys 로 판단한다.
+- SQLite: EXPLAIN QUERY PLAN 에서 인덱스 없이 "SCAN <테이블>" 인 행
+"""
+import sys
+from typing import List
+
+from sqlalchemy import desc, func, select, text
+
+from app.database import engine
+from app.models import Comment, Conversation, Follow, Message, Mood, Post
+from app.models.medicines import Medicine
+import app.models.profile_customization  # noqa: F401  User 관계 설정에 필요
+
+HOT_QUERIES = {
+    "chat history": select(Message.id)
+        .where(Message.sender_id == 1, Message.receiver_id == 2)
+        .order_by(desc(Message.timestamp)).limit(50),
+    "unread messages": select(func.count(Message.id))
+        .where(Message.receiver_id == 1, Message.is_read == False),
+    "inbox": select(Conversation.id)
+        .where(Conversation.user_low_id == 1)
+        .order_by(desc(Conversation.last_message_at)).limit(30),
+    "following": select(Follow.following_id).where(Follow.follower_id == 1),
+    "followers": select(Follow.follower_id).where(Follow.following_id == 1),
+    "is following": select(Follow.id).where(Follow.follower_id == 1, Follow.following_id == 2),
+    "post comments": select(Comment.id).where(Comment.post_id == 1).order_by(Comment.created_at),
+    "latest moods": select(Mood.id).where(Mood.user_id.in_([1, 2])).order_by(desc(Mood.created_at)),
+    "author posts": select(Post.id).where(Post.user_id == 1).order_by(desc(Post.created_at)).limit(20),
+    "medicines by date": select(Medicine.id).where(Medicine.date == "2026-01-01"),
+}
+
+
+def _full_scans_mysql(conn, sql: str) -> List[str]:
+    rows = conn.execute(text(f"EXPLAIN {sql}")).mappings().all()
+    return [
+        row["table"] for row in rows
+        if row["type"] == "ALL" and not row["possible_keys"] and not str(row["table"]).startswith("<")
+    ]
+
+
+def _full_scans_sqlite(conn, sql: str) -> List[str]:
+    tables = {Comment.__table__.name, Conversation.__table__.name, Follow.__table__.name,
+              Message.__table__.name, Mood.__table__.name, Post.__table__.name, Medicine.__table__.name}
+    scans = []
+    for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")):
+        detail = row[-1]
+        words = detail.split()
+        if len(words) >= 2 and words[0] == "SCAN" and words[1] in tables and "INDEX" not in detail:
+            scans.append(words[1])
+    return scans
+
+
+def check_query_plans(bind=engine) -> List[str]:
+    """인덱스 없이 전체 스캔하는 쿼리 설명 목록 (비어 있으면 통과)"""
+    full_scans = _full_scans_sqlite if bind.dialect.name == "sqlite" else _full_scans_mysql
+    failures = []
+    with bind.connect() as conn:
+        for name, statement in HOT_QUERIES.items():
+            sql = str(statement.compile(dialect=bind.dialect, compile_kwargs={"literal_binds": True}))
+            for table in full_scans(conn, sql):
+                failures.append(f"{name}: full scan on {table}")
+    return failures
+
+
+def main():
+    failures = check_query_plans()
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print(f"✅ 실행 계획 점검 통과: {len(HOT_QUERIES)}개 쿼리")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# app/commands/reconcile_follow_counts.py
+"""
+users.follower_count / following_count 를 follows 테이블 기준으로 맞추는 명령.
+
+    python -m app.commands.reconcile_follow_counts
+
+컬럼 추가와 첫 백필은 alembic upgrade head (e91f3b6c0d27) 가 한다.
+카운터가 어긋날 수 있으므로 cron 등으로 주기적으로 실행해도 된다.
+"""
+from app.database import SessionLocal
+from app.utils.follow_counts import reconcile_follow_counts
+import app.models.profile_customization  # noqa: F401  User 관계 설정에 필요
+
+
+def main():
+    db = SessionLocal()
+    try:
+        fixed = reconcile_follow_counts(db)
+        db.commit()
+        print(f"✅ 팔로우 수 보정 완료: {fixed}명")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
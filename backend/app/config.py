@@ -12,6 +12,79 @@ class Settings(BaseSettings):
     db_user: str = "root"
     db_password: str = "rootpw"
     db_name: str = "carering"
+    database_url: str = ""  # 비어 있으면 위 값으로 mysql+pymysql URL 을 만든다
+    async_database_url: str = ""  # 비어 있으면 mysql+aiomysql URL (테스트: sqlite+aiosqlite:///./test.db)
+    db_echo: bool = False  # SQL 로그 출력 (개발용, 운영에서는 끄기)
+    # 커넥션 풀: 워커 수 × (pool_size + max_overflow) 가 MySQL max_connections 를 넘지 않게 잡는다
+    db_pool_size: int = 10  # 엔진마다 유지하는 커넥션 수
+    db_max_overflow: int = 20  # 풀이 가득 찼을 때 추가로 여는 커넥션 수
+    db_pool_timeout: float = 10.0  # 커넥션을 기다리는 최대 시간 (초), 넘으면 TimeoutError
+    db_pool_recycle: int = 1800  # 이 시간(초)보다 오래된 커넥션은 다시 연결 (MySQL wait_timeout 대비)
+    db_pool_pre_ping: bool = True  # 꺼내기 전에 끊긴 커넥션인지 확인
+    # 읽기 전용 복제본 (쉼표로 구분한 sync URL, 비어 있으면 모든 요청이 primary 로)
+    db_replica_urls: str = ""
+    db_read_your_writes_window: float = 5.0  # 쓰기 후 이 시간(초) 동안은 그 사용자의 읽기도 primary 로
+
+    # 🧠 Redis 설정 (빈 문자열이면 프로세스 내 저장소로 대체)
+    redis_url: str = "redis://localhost:6379/0"
+    socketio_channel: str = "socketio"  # 워커 간 Socket.IO emit 을 전파하는 pub/sub 채널
+    chat_relay_batch_size: int = 100  # chat_channel 에서 한 번에 꺼내 디코딩하는 메시지 수
+    chat_relay_max_inflight: int = 256  # 동시에 진행하는 Socket.IO emit 수 (넘치면 읽기 대기)
+    chat_relay_backoff_max: float = 30.0  # 재구독 대기 최대 시간 (초)
+    # 요청 중 PUBLISH 는 버퍼에 넣고 백그라운드에서 파이프라인으로 보낸다
+    redis_publish_pool_size: int = 10  # publisher 전용 커넥션 풀 크기
+    redis_publish_buffer_size: int = 10000  # 전송 대기 버퍼 (넘치면 dead-letter)
+    redis_publish_batch_size: int = 100  # 파이프라인 한 번에 보내는 PUBLISH 수
+    redis_publish_max_retries: int = 3  # 실패 시 재시도 횟수 (넘으면 dead-letter)
+    redis_publish_dead_letter_size: int = 1000  # 보관하는 dead-letter 최대 개수
+
+    # 📡 Go 실시간 서버 연결 (/notify-go)
+    go_ws_url: str = "ws://localhost:8082/ws"
+    go_ws_token: str = ""  # 비어 있지 않으면 ?token= 으로 붙인다
+    go_ws_connections: int = 2  # 워커마다 유지하는 WebSocket 수
+    go_ws_queue_size: int = 1000  # 송신 대기 큐 (가득 차면 /notify-go 가 503)
+    go_ws_batch_size: int = 50  # 한 번에 꺼내 이어서 보내는 메시지 수
+    go_ws_connect_timeout: float = 5.0  # 연결 시도 제한 시간 (초)
+    go_ws_reconnect_max: float = 30.0  # 재연결 대기 최대 시간 (초)
+
+    # 💬 WebSocket 송신 큐 (댓글/타이핑 전송)
+    ws_send_queue_size: int = 64  # 연결마다 쌓아 두는 최대 메시지 수
+    ws_slow_client_policy: str = "drop_oldest"  # 큐가 가득 차면: drop_oldest (오래된 것 버림) | disconnect (연결 종료)
+    ws_max_dropped: int = 256  # drop_oldest 에서 이만큼 연속으로 버리면 연결 종료
+    ws_send_timeout: float = 10.0  # 메시지 하나 보내는 데 이보다 오래 걸리면 연결 종료 (초)
+
+    # 📰 홈 타임라인 설정
+    timeline_max_len: int = 800  # 사용자별 타임라인에 보관하는 최대 게시글 수
+    timeline_fanout_threshold: int = 5000  # 팔로워가 이 수 이상이면 fan-out-on-read 로 전환
+
+    # ❤️ 좋아요 카운터 설정
+    like_flush_interval: float = 5.0  # 카운터를 posts.likes 로 내려 쓰는 주기 (초)
+    like_flush_batch: int = 500  # 한 번에 내려 쓰는 게시글 수
+
+    # 👥 팔로우 그래프 캐시 설정
+    follow_graph_max_users: int = 100000  # 메모리에 들고 있는 사용자별 인접 목록 최대 개수
+
+    # 😊 무드 스토리 설정
+    mood_stories_cache_ttl: int = 30  # 사용자별 스토리 트레이 캐시 유지 시간 (초)
+
+    # 🔑 인증 캐시 설정
+    auth_token_cache_size: int = 10000  # 검증된 토큰을 기억하는 최대 개수
+    auth_user_cache_ttl: float = 60.0  # 인증된 사용자 정보 캐시 유지 시간 (초)
+    auth_user_cache_size: int = 10000  # 사용자 정보 캐시 최대 개수
+
+    # 🔒 비밀번호 해싱 설정
+    password_hash_workers: int = 4  # bcrypt 를 돌리는 전용 스레드 수
+    password_hash_max_queue: int = 64  # 대기 중인 해싱 작업이 이보다 많으면 503 으로 거절
+
+    # 🔍 요청별 쿼리 계측
+    query_stats_headers: bool = False  # 개발용: 응답 헤더에 쿼리 수/시간/반복 쿼리 표시
+    query_repeat_threshold: int = 5  # 같은 모양의 쿼리가 한 요청에서 이만큼 반복되면 N+1 의심
+
+    # 📝 로그 설정
+    log_level: str = "INFO"
+    log_format: str = "json"  # json | text (개발용)
+    log_sample_rates: str = "socketio=0.1,websocket=0.1,broadcast=0.01"  # 카테고리=남길 비율 (WARNING 이상은 항상 남김)
+    log_queue_size: int = 10000  # 출력 대기 로그가 이보다 많으면 버림 (요청을 막지 않음)
 
     # ✅ 기타 설정
     secret_key: str = "super-secret-value-123"
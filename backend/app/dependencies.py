@@ -6,37 +6,51 @@ from jose import JWTError, jwt
 from app.database import get_db
 from app.models.user import User
 from app.config import settings  # ✅ 설정 객체 import
+from app.utils.auth_cache import token_cache, user_cache
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
 
 # OAuth2 스킴 설정
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")  # 프론트의 로그인 경로에 따라 조정
 
-# ✅ 현재 로그인된 사용자 확인
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
-    print("📦 Token received in dependency:", token)
-
+# ✅ 토큰만 검증해서 user_id 반환 (DB 조회 없음)
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
     if not token or "." not in token:
-        print("❌ Invalid token format")
+        logger.info("토큰 형식 오류", extra={"category": "auth"})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="유효하지 않은 토큰 형식입니다."
         )
 
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])  # ✅ 수정
-        print("✅ Token payload:", payload)
         user_id: int = payload.get("user_id")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="토큰에 사용자 정보가 없습니다.")
     except JWTError as e:
-        print("❌ JWT decoding failed:", str(e))
+        logger.info("JWT 디코딩 실패", extra={"category": "auth", "error": str(e)})
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="토큰 검증 실패")
 
+    token_cache.put(token, user_id, payload.get("exp"))
+    return user_id
+
+# ✅ 현재 로그인된 사용자 확인
+def get_current_user(
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+) -> User:
+    user = user_cache.get(db, user_id)
+    if user is not None:
+        return user
+
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="사용자를 찾을 수 없습니다.")
 
-    print("🙆 인증된 유저 반환:", user.email)
-    return user
\ No newline at end of file
+    user_cache.put(user)
+    return user
@@ -1,13 +1,15 @@
 import os
 import asyncio
+from contextlib import asynccontextmanager
 from typing import Optional
 from fastapi import FastAPI, HTTPException, Depends, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
-import redis.asyncio as aioredis # ✅ Redis 비동기 클라이언트 임포트
-import json # ✅ JSON 처리 임포트
 from app.sockets import sio
 import socketio
 from socketio import ASGIApp
@@ -15,8 +17,8 @@ from app.routes import mood
 from app.routes import widget_layout
 from app.routes import upload 
 # 📦 내부 모듈 임포트
-from app.auth.utils import hash_password, verify_token
-from app.database import Base, engine, SessionLocal, get_db
+from app.auth.utils import hash_password_async, verify_token, password_pool
+from app.database import Base, engine, async_engine, async_replica_engines, get_db, get_async_db
 from app.models import User, Comment, Post, BasicInfo, Lifestyle
 # ✅ 라우터 임포트 시, 해당 파일 내의 `router` 객체를 명시적으로 임포트하는 것이 더 명확합니다.
 from app.routes import basic_info, lifestyle, user, message, follow, favorite
@@ -28,19 +30,58 @@ from app.websocket_routes import router as websocket_router
 from app.routes.login import create_access_token # `create_access_token`은 login 라우터에서 가져옴
 from app.dependencies import get_current_user
 from app.schemas import CommentCreate # `app.schemas`에 CommentCreate가 있다고 가정
-from app.websocket_client import send_message_to_go_server
+from app.websocket_client import go_client
 from app.routes import search
 from app.routes import medicines
 from app.routes import customization
+from app.routes import feed
+from app.routes import metrics
+from app.utils.like_counter import run_like_flusher
+from app.utils.db_routing import mark_recent_write
+from app.utils.query_stats import (
+    QueryStatsMiddleware, QUERY_COUNT_HEADER, QUERY_TIME_HEADER, REPEATED_QUERIES_HEADER
+)
+from app.utils.metrics import MetricsMiddleware
+from app.utils.follow_graph import listen_for_changes as listen_for_follow_changes
+from app.utils.chat_subscriber import run_chat_subscriber
+from app.utils.publisher import publisher
+from app.utils.log import get_logger, setup_logging, shutdown_logging
+
+setup_logging()
+logger = get_logger(__name__)
+
 # ------------------------------
 # ✅ Socket.IO 서버 생성
 # ------------------------------
 
 
+# ------------------------------
+# ✅ 앱 수명 주기 (백그라운드 작업 시작/종료)
+# ------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    background_tasks = [
+        asyncio.create_task(run_like_flusher()),
+        asyncio.create_task(listen_for_follow_changes()),
+        asyncio.create_task(run_chat_subscriber(sio)),  # Redis chat_channel → Socket.IO 방
+        asyncio.create_task(publisher.run()),  # 요청 중 쌓인 Redis PUBLISH 전송
+    ]
+    go_client.start()  # Go 실시간 서버 연결 (첫 메시지 때 연결)
+    yield
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await go_client.close()
+    password_pool.shutdown()
+    for async_db_engine in (async_engine, *async_replica_engines):
+        await async_db_engine.dispose()
+    shutdown_logging()
+
 # ------------------------------
 # ✅ FastAPI 앱 정의
 # ------------------------------
-fastapi_app = FastAPI()
+fastapi_app = FastAPI(lifespan=lifespan)
 
 # ✅ CORS 설정
 fastapi_app.add_middleware(
@@ -49,9 +90,16 @@ fastapi_app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", QUERY_COUNT_HEADER, QUERY_TIME_HEADER, REPEATED_QUERIES_HEADER],  # 키셋 페이지네이션 커서, 쿼리 계측
 )
 
-# ✅ DB 테이블 생성
+# ✅ 요청별 DB 쿼리 수/시간 계측 (N+1 의심 쿼리 표시)
+fastapi_app.add_middleware(QueryStatsMiddleware)
+
+# ✅ 라우트별 지연 히스토그램, 처리 중 요청 수 (/metrics)
+fastapi_app.add_middleware(MetricsMiddleware)
+
+# ✅ DB 테이블 생성 (새 DB 용, 기존 DB 의 인덱스/컬럼 변경은 alembic upgrade head)
 Base.metadata.create_all(bind=engine)
 
 # ✅ 정적 디렉토리 마운트
@@ -68,22 +116,25 @@ class SignupRequest(BaseModel):
     password: str
 
 @fastapi_app.post("/signup")
-async def signup(data: SignupRequest):
-    db = SessionLocal()
+async def signup(data: SignupRequest, db: AsyncSession = Depends(get_async_db)):
+    # DB 는 비동기 세션, bcrypt 는 전용 해싱 풀에서 실행해 이벤트 루프를 막지 않는다
+    if await db.scalar(select(User.id).where(User.email == data.email)):
+        raise HTTPException(status_code=400, detail="이미 존재하는 이메일입니다.")
+    hashed_password = await hash_password_async(data.password)
+    new_user = User(nickname=data.nickname, email=data.email, password=hashed_password)
+    db.add(new_user)
     try:
-        if db.query(User).filter(User.email == data.email).first():
-            raise HTTPException(status_code=400, detail="이미 존재하는 이메일입니다.")
-        hashed_password = hash_password(data.password)
-        new_user = User(nickname=data.nickname, email=data.email, password=hashed_password)
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.flush()
         db.add(BasicInfo(user_id=new_user.id))
-        db.commit()
-        access_token = create_access_token(data={"user_id": new_user.id})
-        return {"access_token": access_token, "token_type": "bearer"}
-    finally:
-        db.close()
+        await db.commit()
+    except IntegrityError:
+        # 중복 확인 이후 같은 이메일로 동시에 가입한 경우
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="이미 존재하는 이메일입니다.")
+    # 가입 요청에는 토큰이 없으므로 새 사용자를 직접 primary 읽기 대상으로 표시
+    mark_recent_write(new_user.id)
+    access_token = create_access_token(data={"user_id": new_user.id})
+    return {"access_token": access_token, "token_type": "bearer"}
 
 # ------------------------------
 # ✅ Go 서버로 WebSocket 메시지 전송
@@ -99,11 +150,14 @@ async def notify_go_server(payload: dict): # ✅ payload를 받도록 수정
         "room": room,
         "content": content
     }
-    try:
-        asyncio.create_task(send_message_to_go_server(data_to_go))
-        return {"status": "✅ 전송 요청 완료", "details": "Message forwarded to Go server"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # 송신 큐에 넣고 바로 반환, Go 서버가 밀려 큐가 가득 차면 잠시 후 다시 시도하게 함
+    if not go_client.enqueue(data_to_go):
+        raise HTTPException(
+            status_code=503,
+            detail="Go 서버 전송 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+    return {"status": "✅ 전송 요청 완료", "details": "Message queued for Go server", "queue_depth": go_client.queue.qsize()}
 
 # ------------------------------
 # ✅ 라우터 등록 (수정 필요한 핵심 부분)
@@ -124,6 +178,8 @@ fastapi_app.include_router(medicines.router)
 fastapi_app.include_router(customization.router)
 fastapi_app.include_router(widget_layout.router)
 fastapi_app.include_router(upload.router)
+fastapi_app.include_router(feed.router)
+fastapi_app.include_router(metrics.router)
 # ✅ 만약 `app/routes/comment.py`에 이미 라우터가 있다면, 아래 중복 정의는 제거해야 합니다.
 # comment_router = APIRouter()
 # @comment_router.post("/posts/{post_id}/comments")
@@ -144,43 +200,12 @@ fastapi_app.include_router(upload.router)
 # fastapi_app.include_router(comment_router)
 
 
-# ------------------------------
-# ✅ Redis Subscriber Background Task
-# ------------------------------
-async def redis_subscriber():
-    """
-    Redis의 'chat_channel'을 구독하고 수신된 메시지를 Socket.IO 클라이언트에 브로드캐스트합니다.
-    """
-    # Redis 연결 설정 (호스트, 포트 등을 환경에 맞게 조정)
-    r = aioredis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-    pubsub = r.pubsub()
-    await pubsub.subscribe("chat_channel")
-    print("👂 Redis PubSub subscribed to 'chat_channel'")
-
-    async for message in pubsub.listen():
-        if message['type'] == 'message':
-            try:
-                data = json.loads(message['data'])
-                room = data.get('room')
-                if room:
-                    # 특정 방으로 메시지 emit
-                    await sio.emit('message', data, room=room)
-                    print(f"📨 Redis → Room '{room}' → Socket.IO로 메시지 브로드캐스트: {data}")
-                else:
-                    # room 정보가 없으면 모든 클라이언트에 브로드캐스트 (예외 케이스)
-                    await sio.emit('message', data)
-                    print(f"📨 Redis → All Clients → Socket.IO로 메시지 브로드캐스트: {data}")
-            except json.JSONDecodeError as e:
-                print(f"❌ Redis 메시지 JSON 디코딩 실패: {e} - 데이터: {message['data']}")
-            except Exception as e:
-                print(f"❌ Redis 메시지 처리 중 오류 발생: {e}")
-
 # ------------------------------
 # ✅ FastAPI + Socket.IO 통합 실행
 # ------------------------------
 # Socket.IO 앱을 FastAPI 앱에 통합합니다.
 app = socketio.ASGIApp(sio, other_asgi_app=fastapi_app)
 
-# ✅ FastAPI 시작 시 이벤트 핸들러: Redis 리스너 시작
+# ✅ Redis chat_channel 구독은 lifespan 에서 시작 (run_chat_subscriber)
 
 socket_app = ASGIApp(sio, other_asgi_app=app)
@@ -7,6 +7,8 @@ from .message import Message  # ✅ 새로 추가한 모델
 from .follow import Follow
 from .comment_like import CommentLike  # 또는 models.py라면 from .models import CommentLike
 from .mood import Mood  # ← 이것이 있어야 Base.metadata.create_all 이 먹힘
+from .post_like import PostLike
+from .conversation import Conversation
 __all__ = [
     "User",
     "BasicInfo",
@@ -16,5 +18,7 @@ __all__ = [
     "Message",
     "Follow",
     "CommentLike",
-   "Mood"
+   "Mood",
+    "PostLike",
+    "Conversation"
 ]
\ No newline at end of file
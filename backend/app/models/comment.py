@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from app.database import Base
@@ -14,6 +14,12 @@ class Comment(Base):
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())  # 자동 생성 시간
     likes = Column(Integer, default=0)
+
+    # 게시글별 댓글 목록 (작성 순)
+    __table_args__ = (
+        Index("ix_comments_post_created_at", "post_id", "created_at"),
+    )
+
     # 관계 설정
     user = relationship("User", back_populates="comments")
     post = relationship("Post", back_populates="comments")
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class Conversation(Base):
+    """두 사용자 간 대화방 (user_low_id < user_high_id 로 한 쌍당 한 행)"""
+    __tablename__ = "conversations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_low_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_high_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+
+    # 마지막 메시지 정보 (목록 화면용 비정규화)
+    last_message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True)
+    last_message_at = Column(DateTime, nullable=True)
+
+    # 각 참여자가 아직 읽지 않은 메시지 수
+    unread_count_low = Column(Integer, nullable=False, default=0)
+    unread_count_high = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("user_low_id", "user_high_id", name="unique_conversation_pair"),
+        # 받은편지함은 참여자 기준 최신순 범위 스캔
+        Index("ix_conversations_low_last_message", "user_low_id", "last_message_at"),
+        Index("ix_conversations_high_last_message", "user_high_id", "last_message_at"),
+    )
+
+    last_message = relationship("Message", foreign_keys=[last_message_id])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, func, Index, UniqueConstraint
 from app.database import Base
 
 class Follow(Base):
@@ -7,4 +7,11 @@ class Follow(Base):
     id = Column(Integer, primary_key=True, index=True)
     follower_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     following_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(DateTime, default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        # 같은 관계가 두 번 저장되지 않도록 + 팔로잉 목록 조회
+        UniqueConstraint("follower_id", "following_id", name="unique_follow_pair"),
+        # 팔로워 목록 조회
+        Index("ix_follows_following_follower", "following_id", "follower_id"),
+    )
@@ -8,6 +8,6 @@ class Medicine(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(100))  # ✅ 길이 지정
-    date = Column(String(20)) 
+    date = Column(String(20), index=True)  # 날짜별 복약 목록
     time = Column(String(20), nullable=False)   # ✅ 길이 명시
     title = Column(String(100), nullable=False) # ✅ 길이 명시
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -14,6 +14,13 @@ class Message(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     is_read = Column(Boolean, default=False)
 
+    # 1:1 대화 내역 조회 (보낸 사람, 받는 사람, 시간순)
+    __table_args__ = (
+        Index("ix_messages_sender_receiver_timestamp", "sender_id", "receiver_id", "timestamp"),
+        # 안 읽은 메시지 수 / 읽음 처리
+        Index("ix_messages_receiver_is_read", "receiver_id", "is_read"),
+    )
+
     # 관계 설정: 사용자 모델과 연결
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_messages")
     receiver = relationship("User", foreign_keys=[receiver_id], back_populates="received_messages")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -13,4 +13,9 @@ class Mood(Base):
     image = Column(String(255), nullable=True)  # ✅ 길이 명시
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # 사용자별 최신 무드 (스토리 트레이)
+    __table_args__ = (
+        Index("ix_moods_user_created_at", "user_id", "created_at"),
+    )
+
     user = relationship("User", back_populates="moods")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, LargeBinary, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, LargeBinary, func, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.hybrid import hybrid_property
 from datetime import datetime
@@ -26,12 +26,19 @@ class Post(Base):
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # 작성자별 최신 게시글 (프로필, fan-out-on-read 타임라인)
+    __table_args__ = (
+        Index("ix_posts_user_created_at", "user_id", "created_at"),
+    )
+
     # 댓글 연결, 게시글 삭제 시 댓글도 함께 삭제
     comments = relationship(
         "Comment",
         back_populates="post",
         cascade="all, delete-orphan"
     )
+    # 사용자별 좋아요 기록, 게시글 삭제 시 함께 삭제
+    post_likes = relationship("PostLike", back_populates="post", cascade="all, delete-orphan")
 
     # 작성자 닉네임 속성
     @hybrid_property
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+class PostLike(Base):
+    __tablename__ = "post_likes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    post_id = Column(Integer, ForeignKey("posts.id"), nullable=False)
+
+    __table_args__ = (UniqueConstraint('user_id', 'post_id', name='unique_user_post_like'),)
+
+    user = relationship("User", back_populates="post_likes")
+    post = relationship("Post", back_populates="post_likes")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -14,6 +14,10 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     profile_image = Column(String(255), nullable=True)
 
+    # 팔로우 수 (toggle_follow 가 같은 트랜잭션에서 갱신, 어긋나면 reconcile_follow_counts 로 복구)
+    follower_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    following_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+
     # ✅ 관계 설정
     basic_info = relationship("BasicInfo", back_populates="user", uselist=False)
     lifestyle = relationship("Lifestyle", backref="user", uselist=False)
@@ -23,6 +27,7 @@ class User(Base):
     received_messages = relationship("Message", foreign_keys='Message.receiver_id', back_populates="receiver")
     # models.py 또는 user.py 안에서 User 모델 정의 내에 추가
     comment_likes = relationship("CommentLike", back_populates="user")
+    post_likes = relationship("PostLike", back_populates="user")
     # models/user.py (혹은 BaseUser 클래스 등)
     moods = relationship("Mood", back_populates="user")
     customization = relationship("ProfileCustomization", back_populates="user", uselist=False)
\ No newline at end of file
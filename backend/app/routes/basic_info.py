@@ -2,10 +2,12 @@ import os
 import uuid
 import shutil
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from app.database import get_db
+from app.database import get_async_db, get_primary_db
 from app.models.basic_info import BasicInfo
 from app.models.user import User
 from app.dependencies import get_current_user
@@ -24,10 +26,10 @@ async def create_or_update_basic_info(
     height: float = Form(...),
     weight: float = Form(...),
     profile_image: Optional[UploadFile] = File(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    info = db.query(BasicInfo).filter(BasicInfo.user_id == current_user.id).first()
+    info = await db.scalar(select(BasicInfo).where(BasicInfo.user_id == current_user.id))
     image_url = info.image_url if info else None
 
     # ✅ 이미지 저장
@@ -59,8 +61,7 @@ async def create_or_update_basic_info(
         )
         db.add(info)
 
-    db.commit()
-    db.refresh(info)
+    await db.commit()
 
     return {
         "message": "Basic info saved or updated",
@@ -70,7 +71,7 @@ async def create_or_update_basic_info(
 
 @router.get("/basic-info/me")
 def get_my_basic_info(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_primary_db),
     current_user: User = Depends(get_current_user)
 ):
     info = db.query(BasicInfo).filter(BasicInfo.user_id == current_user.id).first()
@@ -99,7 +100,7 @@ def get_my_basic_info(
     }
 
 @router.get("/basic-info/{user_id}")
-def get_basic_info(user_id: int, db: Session = Depends(get_db)):
+def get_basic_info(user_id: int, db: Session = Depends(get_primary_db)):
     info = db.query(BasicInfo).filter(BasicInfo.user_id == user_id).first()
     if not info:
         # ✅ 기본 정보 자동 생성 (다른 유저도 요청 가능하게 처리)
@@ -1,55 +1,57 @@
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Dict, List
-import json
 
-from app.database import get_db
-from app.models import Comment, CommentLike, User
+from app.database import get_db, get_async_db
+from app.models import Comment, CommentLike, Post, User
 from app.schemas import CommentCreate, CommentResponse  # ✅ import
 from app.models.user import User
 from app.dependencies import get_current_user
-import redis
-import json
-
-# Redis 클라이언트 설정 (파일 상단에 위치)
-redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
-
-def broadcast_to_go(user: str, message: str):
-    payload = json.dumps({"user": user, "msg": message})
-    redis_client.publish("chat_channel", payload)
+from app.utils.metrics import WEBSOCKET_CONNECTIONS, register_collector, room_size_families
+from app.utils.publisher import broadcast_to_go
+from app.utils.log import get_logger
+from app.utils.ws_sender import QueuedWebSocket, broadcast
 
 router = APIRouter()
+logger = get_logger(__name__)
 
-# WebSocket 연결 관리용 딕셔너리
-active_connections: Dict[int, List[WebSocket]] = {}
+# WebSocket 연결 관리용 딕셔너리 (연결마다 송신 큐)
+active_connections: Dict[int, List[QueuedWebSocket]] = {}
 
 # 클라이언트 연결 및 메시지 수신 처리
 async def handle_comment_ws(websocket: WebSocket, post_id: int):
     await websocket.accept()
-    if post_id not in active_connections:
-        active_connections[post_id] = []
-    active_connections[post_id].append(websocket)
+    client = QueuedWebSocket(websocket, endpoint="/ws/comments")
+    client.start()
+    active_connections.setdefault(post_id, []).append(client)
+    WEBSOCKET_CONNECTIONS.inc(endpoint="/ws/comments")
     try:
         while True:
             await websocket.receive_text()  # 클라이언트 ping
     except WebSocketDisconnect:
-        active_connections[post_id].remove(websocket)
-        print(f"🔌 WebSocket disconnected: post_id={post_id}")
-
-# 댓글 실시간 전송
-async def notify_comment_clients(post_id: int, comment_data: dict):
-    if post_id not in active_connections:
-        return
-
-    living_clients = []
-    for ws in active_connections[post_id]:
-        try:
-            await ws.send_text(json.dumps(comment_data))
-            living_clients.append(ws)
-        except:
-            pass  # 실패한 클라이언트 무시
-
-    active_connections[post_id] = living_clients
+        logger.info("댓글 WebSocket 연결 해제", extra={"category": "websocket", "post_id": post_id})
+    finally:
+        clients = active_connections.get(post_id, [])
+        if client in clients:
+            clients.remove(client)
+        if not clients:
+            active_connections.pop(post_id, None)
+        WEBSOCKET_CONNECTIONS.dec(endpoint="/ws/comments")
+        await client.close()
+
+# /metrics 용 게시글별 구독자 수
+@register_collector
+def _comment_room_families():
+    sizes = {str(post_id): len(clients) for post_id, clients in list(active_connections.items())}
+    return room_size_families("websocket", sizes, endpoint="/ws/comments")
+
+# 댓글 실시간 전송 (각 연결의 송신 큐에 넣기만 하고 바로 반환)
+def notify_comment_clients(post_id: int, comment_data: dict):
+    clients = active_connections.get(post_id)
+    if clients:
+        broadcast(clients, comment_data)
 
 # WebSocket 라우트
 @router.websocket("/ws/comments/{post_id}")
@@ -57,15 +59,15 @@ async def websocket_comments(websocket: WebSocket, post_id: int):
     await handle_comment_ws(websocket, post_id)
 
 # 댓글 작성 API
-@router.post("/posts/{post_id}/comments")
+@router.post("/posts/{post_id}/comments", response_model=CommentResponse)
 async def create_comment(
     post_id: int,
     comment: CommentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    post = db.query(Post).filter(Post.id == post_id).first()
-    if not post:
+    post_exists = await db.scalar(select(Post.id).where(Post.id == post_id))
+    if not post_exists:
         raise HTTPException(status_code=404, detail="Post not found")
 
     new_comment = Comment(
@@ -74,10 +76,10 @@ async def create_comment(
         post_id=post_id
     )
     db.add(new_comment)
-    db.commit()
-    db.refresh(new_comment)
+    await db.commit()
+    await db.refresh(new_comment)
 
-    await notify_comment_clients(post_id, {
+    notify_comment_clients(post_id, {
         "id": new_comment.id,
         "user_name": current_user.nickname,
         "user_profile_image": current_user.profile_image,
@@ -85,8 +87,17 @@ async def create_comment(
         "user_id": current_user.id,
         "created_at": str(new_comment.created_at)
     })
-
-    return {"message": "Comment added"}
+    # ✅ Redis를 통해 Go 서버로 브로드캐스트
+    broadcast_to_go(current_user.nickname, comment.content)
+
+    return CommentResponse(
+        id=new_comment.id,
+        content=new_comment.content,
+        user_id=new_comment.user_id,
+        user_nickname=current_user.nickname,
+        user_name=current_user.nickname,
+        user_profile_image=current_user.profile_image,
+    )
 
 # 댓글 삭제 API
 @router.delete("/comments/{comment_id}")
@@ -118,15 +129,21 @@ def delete_comment(
 
 # ✅ 댓글 목록 조회 API
 @router.get("/posts/{post_id}/comments", response_model=List[CommentResponse])
-def get_comments(post_id: int, db: Session = Depends(get_db)):
-    comments = db.query(Comment).filter(Comment.post_id == post_id).all()
+async def get_comments(post_id: int, db: AsyncSession = Depends(get_async_db)):
+    # 작성자 정보까지 한 번에 조회 (댓글마다 users 를 lazy load 하지 않음)
+    rows = await db.execute(
+        select(Comment, User.nickname, User.profile_image)
+        .join(User, User.id == Comment.user_id)
+        .where(Comment.post_id == post_id)
+    )
     result = []
-    for comment in comments:
+    for comment, nickname, profile_image in rows:
         result.append({
             "id": comment.id,
             "user_id": comment.user_id,
-            "user_name": comment.user.nickname,
-            "user_profile_image": comment.user.profile_image,
+            "user_nickname": nickname,
+            "user_name": nickname,
+            "user_profile_image": profile_image,
             "content": comment.content,
             "created_at": comment.created_at.isoformat(),
         })
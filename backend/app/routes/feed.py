@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models import Post
+from app.schemas.post import PostResponse
+from app.dependencies import get_current_user_id
+from app.routes.post import feed_query, feed_item, FEED_DEFAULT_LIMIT, FEED_MAX_LIMIT
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.timeline import get_followee_ids, read_timeline
+from app.utils.like_counter import like_counts
+
+router = APIRouter(prefix="/feed", tags=["Feed"])
+
+# ✅ 홈 타임라인 (내가 팔로우한 사람들 + 내 게시글)
+@router.get("/home", response_model=List[PostResponse])
+def get_home_feed(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(FEED_DEFAULT_LIMIT, ge=1, le=FEED_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    """
+    미리 만들어 둔 타임라인에서 한 페이지 분량의 post id 만 읽고, 해당 게시글만 한 번에 조회한다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더에 커서를 담아 준다.
+    """
+    before = None
+    parts = decode_cursor(cursor, 1)
+    if parts:
+        try:
+            before = int(parts[0])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    followee_ids = get_followee_ids(db, current_user_id)
+    post_ids = read_timeline(db, current_user_id, followee_ids, before, limit)
+    if not post_ids:
+        return []
+
+    # 언팔로우 이후 남아 있는 항목은 여기서 걸러낸다
+    visible_authors = {current_user_id, *followee_ids}
+    rows = feed_query(db).filter(Post.id.in_(post_ids)).order_by(Post.id.desc()).all()
+
+    if len(post_ids) == limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(post_ids[-1])
+
+    live_likes = like_counts(post_ids)
+    return [
+        feed_item(post, nickname, count, live_likes.get(post.id))
+        for post, nickname, count in rows
+        if post.user_id in visible_authors
+    ]
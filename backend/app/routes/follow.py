@@ -1,12 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from redis import RedisError
 from app.database import get_db
 from app.models import Follow, User
 from app.schemas.follow import FollowResponse
-from app.dependencies import get_current_user
-import traceback
+from app.dependencies import get_current_user, get_current_user_id
+from app.utils.follow_graph import follow_graph
+from app.utils.follow_counts import apply_follow_delta
+from app.utils.mood_stories import get_stories_cache
+from app.utils.timeline import backfill_followee
+from app.utils.log import get_logger
 
 router = APIRouter(prefix="/follow", tags=["Follow"])
+logger = get_logger(__name__)
 
 # ✅ 내 팔로우/팔로워 수
 @router.get("/me", response_model=FollowResponse)
@@ -15,20 +22,14 @@ def get_my_follow_data(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        print(f"✅ current_user = {current_user.id} ({current_user.nickname})")
-
-        follower_count = db.query(Follow).filter(Follow.following_id == current_user.id).count()
-        following_count = db.query(Follow).filter(Follow.follower_id == current_user.id).count()
-
         return FollowResponse(
-            follower_count=follower_count,
-            following_count=following_count,
+            follower_count=current_user.follower_count,
+            following_count=current_user.following_count,
             is_following=False
         )
 
     except Exception:
-        print("❌ Exception in /follow/me")
-        traceback.print_exc()
+        logger.exception("/follow/me 처리 중 오류")
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
@@ -37,16 +38,12 @@ def get_my_follow_data(
 def get_follow_data(
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     try:
-        follower_count = db.query(Follow).filter(Follow.following_id == user_id).count()
-        following_count = db.query(Follow).filter(Follow.follower_id == user_id).count()
-
-        is_following = db.query(Follow).filter(
-            Follow.follower_id == current_user.id,
-            Follow.following_id == user_id
-        ).first() is not None
+        counts = db.query(User.follower_count, User.following_count).filter(User.id == user_id).first()
+        follower_count, following_count = counts if counts else (0, 0)
+        is_following = follow_graph.is_following(db, current_user_id, user_id)
 
         return FollowResponse(
             follower_count=follower_count,
@@ -54,11 +51,18 @@ def get_follow_data(
             is_following=is_following
         )
     except Exception:
-        print(f"❌ Error in /follow/{user_id}")
-        traceback.print_exc()
+        logger.exception("/follow/{user_id} 처리 중 오류", extra={"user_id": user_id})
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
+def _reset_mood_stories(user_id: int):
+    # 팔로우 대상이 바뀌었으므로 내 스토리 트레이를 다시 만들게 함
+    try:
+        get_stories_cache().delete([user_id])
+    except RedisError as e:
+        logger.error("무드 스토리 캐시 무효화 실패", extra={"user_id": user_id, "error": str(e)})
+
+
 # ✅ 팔로우 토글
 @router.post("/{user_id}", status_code=status.HTTP_200_OK)
 def toggle_follow(
@@ -75,11 +79,26 @@ def toggle_follow(
     ).first()
 
     if follow:
-        db.delete(follow)
+        # 동시에 들어온 언팔로우가 카운터를 두 번 줄이지 않도록 실제로 지운 경우만 반영
+        deleted = db.query(Follow).filter(Follow.id == follow.id).delete(synchronize_session=False)
+        if deleted:
+            apply_follow_delta(db, current_user.id, user_id, -1)
         db.commit()
+        follow_graph.record("unfollow", current_user.id, user_id)
+        _reset_mood_stories(current_user.id)
         return {"message": "Unfollowed"}
     else:
         new_follow = Follow(follower_id=current_user.id, following_id=user_id)
         db.add(new_follow)
+        try:
+            db.flush()
+        except IntegrityError:
+            # 동시에 들어온 팔로우 요청이 먼저 저장됨 (unique_follow_pair)
+            db.rollback()
+            return {"message": "Followed"}
+        apply_follow_delta(db, current_user.id, user_id, 1)
         db.commit()
+        follow_graph.record("follow", current_user.id, user_id)
+        _reset_mood_stories(current_user.id)
+        backfill_followee(db, current_user.id, user_id)
         return {"message": "Followed"}
\ No newline at end of file
@@ -1,88 +1,140 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Tuple
+from bisect import bisect_right
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, union_all, and_, or_
+from sqlalchemy.orm import Session
 from datetime import datetime
-import traceback
+import time
 import json # Ensure json is imported for dumps
 
 from app.database import get_db
-from app.models import Message, User, Follow
+from app.models import Message, User, Conversation
 from app.schemas.user import UserSchema, UserInfo # Ensure UserInfo is imported
 from app.schemas.message import MessageUser, MessageSchema, MessageCreate, MessageResponse
-from app.dependencies import get_current_user
-from app.utils.redis import publish_to_redis
+from app.dependencies import get_current_user, get_current_user_id
+from app.utils.publisher import publish
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.follow_graph import follow_graph
+from app.utils.conversations import record_message, mark_conversation_read, remove_conversation
+from app.utils.log import get_logger
 
 router = APIRouter(prefix="/messages", tags=["Messages"])
+logger = get_logger(__name__)
 
-# ✅ 메시지 전송 가능한 사용자 목록 (내가 팔로우한 사용자만)
+# ✅ 메시지 전송 가능한 사용자 목록 (서로 팔로우한 사용자만)
 @router.get("/available-users/mutual")
-def get_mutual_follow_users(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
-    all_users = db.query(User).filter(User.id != current_user.id).all()
+def get_mutual_follow_users(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user_id: int = Depends(get_current_user_id)
+):
+    mutual_ids = follow_graph.mutual_ids(db, current_user_id)
+
+    parts = decode_cursor(cursor, 1)
+    if parts:
+        try:
+            mutual_ids = mutual_ids[bisect_right(mutual_ids, int(parts[0])):]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    mutuals = []
-    for user in all_users:
-        is_following = db.query(Follow).filter_by(follower_id=current_user.id, following_id=user.id).first() is not None
-        is_follower = db.query(Follow).filter_by(follower_id=user.id, following_id=current_user.id).first() is not None
+    page_ids = mutual_ids[:limit]
+    if len(mutual_ids) > limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page_ids[-1])
 
-        if is_following and is_follower:
-            mutuals.append({
-                "id": user.id,
-                "nickname": user.nickname,
-                "profile_image": user.profile_image,
-                "is_following": True,
-                "is_follower": True
-            })
+    users = db.query(User).filter(User.id.in_(page_ids)).order_by(User.id).all() if page_ids else []
+
+    return [
+        {
+            "id": user.id,
+            "nickname": user.nickname,
+            "profile_image": user.profile_image,
+            "is_following": True,
+            "is_follower": True
+        }
+        for user in users
+    ]
 
-    return mutuals
+# ✅ 받은편지함 한쪽(내가 user_low 또는 user_high 인 대화방) 범위 스캔
+def _inbox_branch(user_id: int, as_low: bool, cursor_at, cursor_id, limit: int):
+    mine = Conversation.user_low_id if as_low else Conversation.user_high_id
+    partner = Conversation.user_high_id if as_low else Conversation.user_low_id
+    unread = Conversation.unread_count_low if as_low else Conversation.unread_count_high
+
+    branch = select(
+        Conversation.id.label("conversation_id"),
+        partner.label("partner_id"),
+        unread.label("unread_count"),
+        Conversation.last_message_id,
+        Conversation.last_message_at,
+    ).where(mine == user_id)
+    if not as_low:
+        # 나와의 대화방은 low 쪽에서만 읽는다
+        branch = branch.where(Conversation.user_low_id != user_id)
+    if cursor_at is not None:
+        branch = branch.where(or_(
+            Conversation.last_message_at < cursor_at,
+            and_(Conversation.last_message_at == cursor_at, Conversation.id < cursor_id)
+        ))
+    branch = branch.order_by(Conversation.last_message_at.desc(), Conversation.id.desc()).limit(limit)
+    return select(branch.subquery())
 
 # ✅ 대화중인 사용자 목록
 @router.get("/users", response_model=List[MessageUser])
 def get_message_users(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(30, ge=1, le=100),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     """
     Retrieves a list of users with whom the current user has active message conversations,
     along with the last message, time, and unread count.
+    Reads the denormalized conversations table, so the cost depends on the page size rather
+    than on the message history. The next page is addressed by the opaque cursor returned
+    in the X-Next-Cursor header.
     """
-    messages = db.query(Message).options(
-        joinedload(Message.sender),
-        joinedload(Message.receiver)
-    ).filter(
-        (Message.sender_id == current_user.id) |
-        (Message.receiver_id == current_user.id)
-    ).order_by(Message.timestamp.desc()).all()
-
-    seen_users = set()
-    message_users = []
-
-    for msg in messages:
-        # Determine the other participant in the conversation
-        target_user = msg.receiver if msg.sender_id == current_user.id else msg.sender
-
-        if not target_user or target_user.id in seen_users:
-            continue
-
-        seen_users.add(target_user.id)
-
-        # Count unread messages from this specific user to the current user
-        unread_count = db.query(Message).filter(
-            Message.receiver_id == current_user.id,
-            Message.sender_id == target_user.id,
-            Message.is_read == False
-        ).count()
-
-        message_users.append(MessageUser(
-            user_id=target_user.id,
-            username=target_user.nickname,
-            profile_image=target_user.profile_image,
-            last_message=msg.content,
-            # Format timestamp for display
-            time=msg.timestamp.strftime("%I:%M %p"),
-            unread_count=unread_count
-        ))
+    cursor_at = cursor_id = None
+    parts = decode_cursor(cursor, 2)
+    if parts:
+        try:
+            cursor_at = datetime.fromisoformat(parts[0])
+            cursor_id = int(parts[1])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    inbox = union_all(
+        _inbox_branch(current_user_id, True, cursor_at, cursor_id, limit + 1),
+        _inbox_branch(current_user_id, False, cursor_at, cursor_id, limit + 1),
+    ).subquery()
 
-    return message_users
+    rows = db.query(inbox, User.nickname, User.profile_image, Message.content) \
+        .join(User, User.id == inbox.c.partner_id) \
+        .outerjoin(Message, Message.id == inbox.c.last_message_id) \
+        .filter(inbox.c.last_message_at.isnot(None)) \
+        .order_by(inbox.c.last_message_at.desc(), inbox.c.conversation_id.desc()) \
+        .limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1].last_message_at.isoformat(), rows[-1].conversation_id
+        )
+
+    return [
+        MessageUser(
+            user_id=row.partner_id,
+            username=row.nickname,
+            profile_image=row.profile_image,
+            last_message=row.content or "",
+            # Format timestamp for display
+            time=row.last_message_at.strftime("%I:%M %p"),
+            unread_count=row.unread_count or 0
+        )
+        for row in rows
+    ]
 
 # ✅ 메시지 전송
 @router.post("/send", response_model=MessageResponse)
@@ -105,6 +157,9 @@ def send_message(
             is_read=False # New messages are initially unread
         )
         db.add(new_message)
+        db.flush()
+        # 대화방의 마지막 메시지/안 읽은 수도 같은 트랜잭션에서 갱신
+        record_message(db, new_message)
         db.commit()
         db.refresh(new_message)
 
@@ -121,14 +176,14 @@ def send_message(
             "message_id": new_message.id, # Include message ID
             "sender_nickname": current_user.nickname, # Include sender info for client display
             "sender_profile_image": current_user.profile_image,
+            "published_at": time.time(),  # chat_channel 전달 지연 측정용
         }
-        # 3. Publish message to Redis (receiver)
-        publish_to_redis("chat_channel", json.dumps(message_payload))
-        # 4. Publish message to Redis (sender)
+        # 3. Publish message to Redis (receiver, sender) - 버퍼에 넣기만 하고 같은 파이프라인으로 전송
+        publish("chat_channel", json.dumps(message_payload))
         sender_payload = dict(message_payload)
         sender_payload["room"] = sender_room
-        publish_to_redis("chat_channel", json.dumps(sender_payload))
-        print(f"✅ Message from {current_user.id} to {data.receiver_id} published to Redis (sender/receiver room)")
+        publish("chat_channel", json.dumps(sender_payload))
+        logger.info("메시지 Redis 발행", extra={"category": "broadcast", "sender_id": current_user.id, "receiver_id": data.receiver_id})
 
         # 4. Return the saved message response
         return MessageResponse(
@@ -142,7 +197,7 @@ def send_message(
 
     except Exception as e:
         db.rollback() # Rollback transaction on error
-        traceback.print_exc() # Print full stack trace for debugging
+        logger.exception("메시지 저장 및 전송 실패", extra={"sender_id": current_user.id, "receiver_id": data.receiver_id})
         raise HTTPException(status_code=500, detail=f"메시지 저장 및 전송 실패: {str(e)}")
 
 # ✅ 받은 메시지 조회 (특정 사용자로부터)
@@ -177,22 +232,93 @@ def get_sent_messages(
     ).order_by(Message.timestamp).all()
     return messages
 
+# ✅ 커서로 받은 메시지 id 의 정렬 위치 (timestamp, id) - 다른 대화의 메시지면 400
+def _thread_position(db: Session, user_id: int, other_user_id: int, message_id: int) -> Tuple[datetime, int]:
+    timestamp = db.scalar(select(Message.timestamp).where(
+        Message.id == message_id,
+        or_(
+            and_(Message.sender_id == user_id, Message.receiver_id == other_user_id),
+            and_(Message.sender_id == other_user_id, Message.receiver_id == user_id),
+        )
+    ))
+    if timestamp is None:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return timestamp, message_id
+
+# ✅ 한 방향(sender → receiver) 메시지만 인덱스 범위로 읽는 쿼리
+# timestamp 는 앱이 넣으므로 워커가 여러 개면 id 순서와 다를 수 있다 → 정렬과 같은 (timestamp, id) 키셋으로 자른다
+def _thread_branch(sender_id: int, receiver_id: int, before: Optional[Tuple[datetime, int]],
+                   after: Optional[Tuple[datetime, int]], limit: int):
+    branch = select(Message.id).where(
+        Message.sender_id == sender_id,
+        Message.receiver_id == receiver_id
+    )
+    if before is not None:
+        timestamp, message_id = before
+        branch = branch.where(or_(
+            Message.timestamp < timestamp,
+            and_(Message.timestamp == timestamp, Message.id < message_id)
+        ))
+    if after is not None:
+        timestamp, message_id = after
+        branch = branch.where(or_(
+            Message.timestamp > timestamp,
+            and_(Message.timestamp == timestamp, Message.id > message_id)
+        ))
+
+    if after is not None:
+        branch = branch.order_by(Message.timestamp.asc(), Message.id.asc())
+    else:
+        branch = branch.order_by(Message.timestamp.desc(), Message.id.desc())
+    return select(branch.limit(limit).subquery())
+
 # ✅ 모든 대화 메시지 조회 (특정 상대방과의 대화)
 @router.get("/chat/{other_user_id}", response_model=List[MessageSchema])
 def get_conversation_messages(
     other_user_id: int,
+    response: Response,
+    before: Optional[int] = Query(None, description="이 메시지 id 보다 오래된 메시지"),
+    after: Optional[int] = Query(None, description="이 메시지 id 이후의 메시지 (재접속 시 놓친 메시지)"),
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user_id: int = Depends(get_current_user_id)
 ):
     """
-    Retrieves all messages exchanged between the current user and another specific user,
-    ordered by timestamp.
+    Retrieves one page of messages exchanged between the current user and another specific user,
+    ordered by timestamp (oldest first).
+
+    - no cursor: the latest `limit` messages
+    - `before=<id>`: the page of older messages right before that message (scrolling up)
+    - `after=<id>`: messages newer than that message, e.g. everything a reconnecting client missed
+
+    When more messages exist in the requested direction, X-Next-Cursor holds the message id to pass
+    as the next `before` / `after` value.
     """
-    messages = db.query(Message).filter(
-        ((Message.sender_id == current_user.id) & (Message.receiver_id == other_user_id)) |
-        ((Message.sender_id == other_user_id) & (Message.receiver_id == current_user.id))
-    ).order_by(Message.timestamp).all()
-    return messages
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either 'before' or 'after', not both")
+
+    before_position = _thread_position(db, current_user_id, other_user_id, before) if before is not None else None
+    after_position = _thread_position(db, current_user_id, other_user_id, after) if after is not None else None
+
+    # OR 조건 대신 방향별 인덱스 범위 스캔 두 개를 합친다
+    thread_ids = union_all(
+        _thread_branch(current_user_id, other_user_id, before_position, after_position, limit + 1),
+        _thread_branch(other_user_id, current_user_id, before_position, after_position, limit + 1),
+    )
+    query = db.query(Message).filter(Message.id.in_(thread_ids))
+
+    if after is not None:
+        messages = query.order_by(Message.timestamp.asc(), Message.id.asc()).limit(limit + 1).all()
+        if len(messages) > limit:
+            messages = messages[:limit]
+            response.headers[NEXT_CURSOR_HEADER] = str(messages[-1].id)
+        return messages
+
+    messages = query.order_by(Message.timestamp.desc(), Message.id.desc()).limit(limit + 1).all()
+    if len(messages) > limit:
+        messages = messages[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = str(messages[-1].id)
+    return messages[::-1]
 
 # ✅ 읽음 처리
 @router.patch("/read/{sender_id}")
@@ -209,6 +335,7 @@ def mark_messages_as_read(
         Message.receiver_id == current_user.id,
         Message.is_read == False
     ).update({Message.is_read: True}, synchronize_session="fetch") # Use "fetch" to ensure updates are flushed
+    mark_conversation_read(db, current_user.id, sender_id)
     db.commit()
     return {"status": "success", "messages_marked_as_read": updated_count}
 
@@ -226,6 +353,7 @@ def delete_chat(
         ((Message.sender_id == current_user.id) & (Message.receiver_id == user_id)) |
         ((Message.sender_id == user_id) & (Message.receiver_id == current_user.id))
     ).delete(synchronize_session="fetch")
+    remove_conversation(db, current_user.id, user_id)
     db.commit()
     return {"status": "success", "messages_deleted": deleted_count}
 
@@ -244,7 +372,9 @@ def mark_single_message_as_read(
     if not message:
         raise HTTPException(status_code=404, detail="Message not found or unauthorized")
 
-    message.is_read = True
+    if not message.is_read:
+        message.is_read = True
+        mark_conversation_read(db, current_user.id, message.sender_id, count=1)
     db.commit()
     return {"status": "success", "message_id": message_id}
 
@@ -0,0 +1,29 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.utils.db_pool import pool_metrics
+from app.utils.metrics import render_metrics
+from app.utils.query_stats import route_query_metrics
+from app.websocket_client import go_client
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+# ✅ Prometheus 스크레이프 용 (라우트 지연, DB/Redis, Socket.IO/WebSocket 연결 수)
+@router.get("", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# ✅ DB 커넥션 풀 상태 (대기 시간, 사용 중 커넥션, overflow, 타임아웃)
+@router.get("/db-pool")
+def get_db_pool_metrics():
+    return {"pools": pool_metrics()}
+
+# ✅ 라우트별 DB 쿼리 수/시간, N+1 의심 요청 수
+@router.get("/db-queries")
+def get_db_query_metrics():
+    return {"routes": route_query_metrics()}
+
+# ✅ Go 실시간 서버 송신 큐 깊이, 버린 메시지 수, 연결 상태
+@router.get("/go-realtime")
+def get_go_realtime_metrics():
+    return go_client.stats()
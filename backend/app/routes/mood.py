@@ -1,6 +1,5 @@
 from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 import shutil
 import uuid
 import os
@@ -8,8 +7,7 @@ import os
 from app.database import get_db
 from app.models.mood import Mood
 from app.models.user import User
-from app.models.basic_info import BasicInfo
-from app.models.follow import Follow
+from app.utils.mood_stories import load_mood_stories, invalidate_mood_stories
 from app.auth.dependencies import get_current_user
 
 router = APIRouter()
@@ -43,6 +41,7 @@ def create_mood(
     db.add(new_mood)
     db.commit()
     db.refresh(new_mood)
+    invalidate_mood_stories(db, current_user.id)
 
     return {"message": "Mood created"}
 
@@ -53,40 +52,4 @@ def get_mood_stories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 내가 팔로우한 사람 목록
-    followees = db.query(Follow).filter(Follow.follower_id == current_user.id).all()
-    followee_ids = [f.following_id for f in followees]
-
-    # 나 포함
-    user_ids = followee_ids + [current_user.id]
-
-    # 각 user_id에 대해 가장 최신 무드만 가져오는 서브쿼리
-    subquery = (
-        db.query(Mood.user_id, Mood.emoji, Mood.memo, Mood.created_at)
-        .filter(Mood.user_id.in_(user_ids))
-        .order_by(Mood.user_id, desc(Mood.created_at))
-        .distinct(Mood.user_id)
-        .all()
-    )
-
-    # user_id 기준으로 최신 무드 매핑
-    mood_map = {m.user_id: m for m in subquery}
-
-    result = []
-    for uid in user_ids:
-        user = db.query(User).filter(User.id == uid).first()
-        basic = db.query(BasicInfo).filter(BasicInfo.user_id == uid).first()
-        mood = mood_map.get(uid)
-
-        result.append({
-            "id": uid,
-            "nickname": user.nickname if user else "",
-            "image_url": basic.image_url if basic else None,
-            "recentMood": {
-                "emoji": mood.emoji if mood else None,
-                "phrase": mood.memo if mood else "",  # 🔥 여기를 phrase → memo 로 수정 완료
-                "created_at": mood.created_at.isoformat() if mood and mood.created_at else None
-            } if mood else None
-        })
-
-    return result
\ No newline at end of file
+    return load_mood_stories(db, current_user.id)
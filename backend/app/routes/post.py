@@ -1,30 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Response
+from sqlalchemy import select, func, or_, and_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 import os, uuid, shutil
 
 from app.database import get_db
-from app.models import Post, Comment
+from app.models import Post, Comment, PostLike
 from app.models.user import User
 from app.models.basic_info import BasicInfo
 from app.models.lifestyle import Lifestyle
 from app.schemas.post import PostResponse
-from app.schemas.comment import CommentCreate, CommentResponse
 from app.schemas.user import UserResponse, UserUpdate, PasswordResetRequest
 from app.auth.utils import hash_password
 from app.dependencies import get_current_user
-import redis
-import json
-
-# Redis 클라이언트
-redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
-
-# Go 서버로 메시지 브로드캐스트
-def broadcast_to_go(user: str, message: str):
-    payload = json.dumps({"user": user, "msg": message})
-    redis_client.publish("chat_channel", payload)
+from app.utils.pagination import encode_cursor, decode_cursor, NEXT_CURSOR_HEADER
+from app.utils.timeline import fan_out_post
+from app.utils.like_counter import add_like, like_counts
+from app.utils.log import get_logger
 
 router = APIRouter()
+logger = get_logger(__name__)
 
 # ------------------------
 # 대표 사용자 검색/수정/삭제
@@ -162,32 +159,80 @@ def create_post(
     db.add(new_post)
     db.commit()
     db.refresh(new_post)
+
+    # ✅ 팔로워들의 홈 타임라인에 반영
+    fan_out_post(db, new_post)
     return new_post
 
-@router.get("/posts", response_model=List[PostResponse])
-def get_posts(db: Session = Depends(get_db)):
-    posts = db.query(Post).all()
-    enriched_posts = []
+FEED_DEFAULT_LIMIT = 20
+FEED_MAX_LIMIT = 100
 
-    for post in posts:
-        user = db.query(User).filter(User.id == post.user_id).first()
-        user_name = user.nickname if user else "Unknown"
 
-        enriched_posts.append({
-            "id": post.id,
-            "user_id": post.user_id,
-            "phrase": post.phrase,
-            "hashtags": post.hashtags,
-            "location": post.location,
-            "person_tag": post.person_tag,
-            "disclosure": post.disclosure,
-            "image_url": post.image_url,
-            "likes": post.likes,
-            "comments": post.comments,
-            "user_name": user_name
-        })
+def feed_query(db: Session):
+    """게시글 + 작성자 닉네임 + 댓글 수를 한 번의 쿼리로 가져오는 기본 피드 쿼리"""
+    comment_count = (
+        select(func.count(Comment.id))
+        .where(Comment.post_id == Post.id)
+        .correlate(Post)
+        .scalar_subquery()
+    )
+    return (
+        db.query(Post, User.nickname, comment_count.label("comment_count"))
+        .outerjoin(User, User.id == Post.user_id)
+    )
 
-    return enriched_posts
+
+def feed_item(post: Post, nickname: Optional[str], comment_count: int, likes: Optional[int] = None) -> dict:
+    return {
+        "id": post.id,
+        "user_id": post.user_id,
+        "phrase": post.phrase,
+        "hashtags": post.hashtags,
+        "location": post.location,
+        "person_tag": post.person_tag,
+        "disclosure": post.disclosure,
+        "image_url": post.image_url,
+        "likes": likes if likes is not None else post.likes,
+        "comments": [],
+        "comment_count": comment_count or 0,
+        "user_name": nickname or "Unknown"
+    }
+
+
+@router.get("/posts", response_model=List[PostResponse])
+def get_posts(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(FEED_DEFAULT_LIMIT, ge=1, le=FEED_MAX_LIMIT),
+    db: Session = Depends(get_db)
+):
+    """
+    최신순 피드. (created_at, id) 키셋 페이지네이션으로 OFFSET 스캔 없이 다음 페이지를 가져온다.
+    다음 페이지가 있으면 X-Next-Cursor 헤더에 불투명 커서를 담아 준다.
+    """
+    query = feed_query(db)
+
+    parts = decode_cursor(cursor, 2)
+    if parts:
+        try:
+            cursor_created_at = datetime.fromisoformat(parts[0])
+            cursor_id = int(parts[1])
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(or_(
+            Post.created_at < cursor_created_at,
+            and_(Post.created_at == cursor_created_at, Post.id < cursor_id)
+        ))
+
+    rows = query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit + 1).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at.isoformat(), last.id)
+
+    live_likes = like_counts(post.id for post, _, _ in rows)
+    return [feed_item(post, nickname, count, live_likes.get(post.id)) for post, nickname, count in rows]
 
 @router.get("/posts/me", response_model=List[PostResponse])
 def get_my_posts(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -209,6 +254,7 @@ def get_my_posts(db: Session = Depends(get_db), current_user: User = Depends(get
             "image_url": post.image_url,
             "likes": post.likes,
             "comments": post.comments,
+            "comment_count": len(post.comments),
             "user_name": user_name
         })
 
@@ -234,6 +280,7 @@ def get_posts_by_user(user_id: int, db: Session = Depends(get_db)):
             "image_url": post.image_url,
             "likes": post.likes,
             "comments": post.comments,
+            "comment_count": len(post.comments),
             "user_name": user_name
         })
 
@@ -261,8 +308,9 @@ def get_post_with_comments(post_id: int, db: Session = Depends(get_db)):
         "person_tag": post.person_tag,
         "disclosure": post.disclosure,
         "image_url": post.image_url,
-        "likes": post.likes,
+        "likes": like_counts([post.id]).get(post.id, post.likes),
         "comments": post.comments,
+        "comment_count": len(post.comments),
         "user_name": user_name  # ✅ 여기에 명시적으로 포함
     }
 @router.delete("/posts/{post_id}")
@@ -284,9 +332,9 @@ def delete_post(
         if os.path.exists(file_path):
             try:
                 os.remove(file_path)
-                print(f"🗑️ 이미지 삭제 완료: {file_path}")
+                logger.info("이미지 삭제 완료", extra={"path": file_path})
             except Exception as e:
-                print(f"❗ 이미지 삭제 실패: {file_path} - {e}")
+                logger.warning("이미지 삭제 실패", extra={"path": file_path, "error": str(e)})
 
     db.delete(post)
     db.commit()
@@ -297,35 +345,30 @@ def like_post(post_id: int, db: Session = Depends(get_db), current_user: User =
     post = db.query(Post).filter(Post.id == post_id).first()
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    post.likes = (post.likes or 0) + 1
-    db.commit()
-    return {"message": "Liked post", "likes": post.likes}
 
-@router.post("/posts/{post_id}/comments", response_model=CommentResponse)
-def create_comment(
-    post_id: int,
-    comment: CommentCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    db_comment = Comment(
-        content=comment.content,
-        user_id=current_user.id,
-        post_id=post_id
-    )
-    db.add(db_comment)
+    # ✅ 사용자별 좋아요 기록으로 중복 좋아요 방지 (멱등)
+    db.add(PostLike(post_id=post_id, user_id=current_user.id))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        likes = like_counts([post_id]).get(post_id, post.likes or 0)
+        return {"message": "Already liked", "likes": likes}
+
+    # ✅ 카운터는 원자적으로 증가, DB 반영은 백그라운드 flusher 가 담당
+    likes = add_like(db, post, 1)
+    return {"message": "Liked post", "likes": likes}
+
+@router.delete("/posts/{post_id}/like")
+def unlike_post(post_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+
+    deleted = db.query(PostLike).filter_by(post_id=post_id, user_id=current_user.id).delete()
     db.commit()
-    db.refresh(db_comment)
-
-    # ✅ Redis를 통해 Go 서버로 브로드캐스트
-    broadcast_to_go(current_user.nickname, comment.content)
-
-    return CommentResponse(
-        id=db_comment.id,
-        content=db_comment.content,
-        user_id=db_comment.user_id,
-        user_nickname=current_user.nickname,
-        user_name=current_user.nickname,
-        user_profile_image=current_user.profile_image, 
-        created_at=db_comment.created_at
-    )
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Not liked")
+
+    likes = add_like(db, post, -1)
+    return {"message": "unliked", "likes": likes}
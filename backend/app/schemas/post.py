@@ -55,7 +55,8 @@ class PostResponse(BaseModel):
     disclosure: Optional[str]
     image_url: Optional[str]
     likes: int
-    comments: List[CommentResponse]
+    comments: List[CommentResponse] = []
+    comment_count: int = 0  # 피드 목록에서는 댓글 본문 대신 개수만 내려줌
     user_name: Optional[str]  # ✅ 여기 추가!
 
     class Config:
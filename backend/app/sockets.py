@@ -1,36 +1,40 @@
 from socketio import AsyncServer
 from fastapi_socketio import SocketManager
-from fastapi import Request
-import redis
-import json
+from fastapi import HTTPException, Request
 
-# ✅ Redis 클라이언트 설정
-redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
+from app.auth.utils import verify_token
+from app.utils.metrics import SOCKETIO_CONNECTIONS, register_collector, room_size_families
+from app.utils.log import get_logger
+from app.utils.socketio_manager import create_client_manager
 
-# ✅ Redis를 통해 Go 서버로 메시지 전달
-def broadcast_to_go(user: str, message: str):
-    payload = json.dumps({"user": user, "msg": message})
-    redis_client.publish("chat_channel", payload)
+logger = get_logger(__name__)
 
-# ✅ Socket.IO 서버 인스턴스
-sio = AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+# ✅ Socket.IO 서버 인스턴스 (emit 은 pub/sub 매니저를 거쳐 모든 워커의 방으로 전달)
+sio = AsyncServer(async_mode="asgi", cors_allowed_origins="*", client_manager=create_client_manager())
 
 @sio.event
 async def connect(sid, environ, auth):
-    token = auth.get('token')
-    user_id = decode_jwt(token)  # 직접 디코딩하는 함수 필요
+    token = (auth or {}).get('token')
+    if not token:
+        raise ConnectionRefusedError("토큰이 없습니다")
+    try:
+        user_id = verify_token(token)
+    except HTTPException:
+        raise ConnectionRefusedError("인증 실패")
     room = f"user_{user_id}"
     await sio.save_session(sid, {'user_id': user_id})
     await sio.enter_room(sid, room)
-    print(f"✅ {sid} joined room {room}")
+    SOCKETIO_CONNECTIONS.inc()
+    logger.info("Socket.IO 연결", extra={"category": "socketio", "sid": sid, "room": room})
 
 @sio.event
 async def disconnect(sid):
+    SOCKETIO_CONNECTIONS.dec()
     session = await sio.get_session(sid)
     user_id = session.get('user_id')
     room = f"user_{user_id}"
     await sio.leave_room(sid, room)
-    print(f"❌ {sid} left room {room}")
+    logger.info("Socket.IO 연결 해제", extra={"category": "socketio", "sid": sid, "room": room})
 
 @sio.event
 async def join(sid, data):
@@ -38,14 +42,14 @@ async def join(sid, data):
     if room:
         await sio.save_session(sid, {'room': room})
         await sio.enter_room(sid, room)
-        print(f"📦 {sid} joined room: {room}")
+        logger.info("Socket.IO 방 입장", extra={"category": "socketio", "sid": sid, "room": room})
 
 @sio.event
 async def leave(sid, data):
     room = data.get("room")
     if room:
         await sio.leave_room(sid, room)
-        print(f"👋 {sid} left room: {room}")
+        logger.info("Socket.IO 방 퇴장", extra={"category": "socketio", "sid": sid, "room": room})
 
 
 @sio.on("leave")
@@ -53,14 +57,14 @@ async def handle_leave(sid, data):
     room = data.get("room")
     if room:
         await sio.leave_room(sid, room)
-        print(f"👋 User with sid {sid} left room: {room}")
+        logger.info("Socket.IO 방 퇴장", extra={"category": "socketio", "sid": sid, "room": room})
 
 @sio.on("join")
 async def handle_join(sid, data):
     room = data.get("room")
     if room:
         await sio.enter_room(sid, room)
-        print(f"✅ User with sid {sid} joined room: {room}")
+        logger.info("Socket.IO 방 입장", extra={"category": "socketio", "sid": sid, "room": room})
 
 
 @sio.event
@@ -73,4 +77,16 @@ async def typing(sid, data):
 @sio.on("send_message")
 async def handle_send_message(sid, data):
     receiver_room = f"user_{data['receiver_id']}"
-    await sio.emit("message", data, room=receiver_room)
\ No newline at end of file
+    await sio.emit("message", data, room=receiver_room)
+
+
+# ✅ /metrics 용 방 크기 (sid 개인 방과 기본 방(None)은 제외)
+@register_collector
+def _socketio_room_families():
+    rooms = sio.manager.rooms.get("/", {})
+    sizes = {
+        room: len(members)
+        for room, members in list(rooms.items())
+        if room is not None and room not in members
+    }
+    return room_size_families("socketio", sizes)
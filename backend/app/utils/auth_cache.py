@@ -0,0 +1,127 @@
+# app/utils/auth_cache.py
+"""
+인증 캐시 (워커 프로세스마다 따로 가짐).
+
+- token_cache: 서명 검증이 끝난 토큰 → user_id. 토큰 해시를 키로 쓰고 토큰의 exp 까지만 기억한다.
+- user_cache: user_id → users 행의 컬럼 값. TTL 이 지나거나 해당 사용자 행이 바뀌어 커밋되면 버린다.
+
+users 행이 ORM 으로 수정되면 자동으로, query().update() 같은 벌크 UPDATE 는
+invalidate_user_on_commit() 을 호출해서 커밋 후에 캐시를 지운다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models import User
+
+_PENDING_KEY = "auth_cache_invalidate_user_ids"
+
+
+class _ExpiringLRU:
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[object, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value, expires_at: float):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenCache:
+    def __init__(self, max_size: int):
+        self._entries = _ExpiringLRU(max_size)
+
+    @staticmethod
+    def _key(token: str) -> str:
+        # 토큰 원문을 메모리에 들고 있지 않도록 해시만 키로 사용
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[int]:
+        return self._entries.get(self._key(token))
+
+    def put(self, token: str, user_id: int, exp: Optional[int]):
+        now = time.time()
+        max_lifetime = settings.JWT_EXPIRATION_MINUTES * 60
+        remaining = min(exp - now, max_lifetime) if exp is not None else max_lifetime
+        if remaining > 0:
+            self._entries.put(self._key(token), user_id, time.monotonic() + remaining)
+
+
+class UserCache:
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self._entries = _ExpiringLRU(max_size)
+
+    def get(self, db: Session, user_id: int) -> Optional[User]:
+        """캐시된 컬럼 값으로 User 를 만들어 이 세션에 붙인다 (SELECT 없이)"""
+        values = self._entries.get(user_id)
+        if values is None:
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    def put(self, user: User):
+        columns = inspect(User).column_attrs
+        values = {attr.key: getattr(user, attr.key) for attr in columns}
+        self._entries.put(user.id, values, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: int):
+        self._entries.pop(user_id)
+
+
+token_cache = TokenCache(settings.auth_token_cache_size)
+user_cache = UserCache(settings.auth_user_cache_ttl, settings.auth_user_cache_size)
+
+
+def invalidate_user_on_commit(db: Session, user_id: int):
+    """현재 트랜잭션이 커밋되면 user_id 의 캐시를 지운다"""
+    db.info.setdefault(_PENDING_KEY, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_updated_users(session: Session, flush_context):
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User) and obj.id is not None:
+            invalidate_user_on_commit(session, obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session):
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session: Session):
+    session.info.pop(_PENDING_KEY, None)
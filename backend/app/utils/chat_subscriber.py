@@ -0,0 +1,141 @@
+# app/utils/chat_subscriber.py
+"""
+Redis chat_channel → Socket.IO 방 전달 (앱 수명 동안 워커마다 하나 실행).
+
+- 연결이 끊기면 지수 백오프로 다시 구독한다.
+- 쌓여 있는 메시지를 한 번에 최대 chat_relay_batch_size 개씩 꺼내 디코딩한다.
+- emit 은 동시에 최대 chat_relay_max_inflight 개까지만 돌리고, 넘치면 읽기를 멈춘다.
+
+모든 워커가 같은 채널을 구독하므로 emit 은 ignore_queue=True 로 이 워커의 클라이언트에만 보낸다
+(Socket.IO pub/sub 매니저로 한 번 더 전파하면 워커 수만큼 중복 전달된다).
+room 이 없는 메시지(broadcast_to_go 가 보내는 Go 서버용 알림 등)는 Socket.IO 로 보내지 않는다
+(room=None 으로 emit 하면 모든 클라이언트에 전달된다).
+"""
+import asyncio
+import json
+import time
+from typing import List, Optional, Set
+
+import redis.asyncio as aioredis
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.metrics import (
+    CHAT_RELAY_BATCH_SIZE, CHAT_RELAY_END_TO_END, CHAT_RELAY_INFLIGHT, CHAT_RELAY_LAG,
+    CHAT_RELAY_MESSAGES, CHAT_RELAY_RECONNECTS,
+)
+
+CHAT_CHANNEL = "chat_channel"
+_BACKOFF_INITIAL = 0.5  # 첫 재연결 대기 (초), 실패할 때마다 두 배
+
+logger = get_logger(__name__)
+
+
+class ChatRelay:
+    """디코딩한 메시지를 Socket.IO 로 보내는 부분 (동시 emit 수 제한)"""
+
+    def __init__(self, sio, max_inflight: int):
+        self.sio = sio
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._tasks: Set[asyncio.Task] = set()
+
+    @staticmethod
+    def decode(raw_messages: List[str]) -> List[dict]:
+        decoded = []
+        for raw in raw_messages:
+            try:
+                data = json.loads(raw)
+            except (TypeError, json.JSONDecodeError) as e:
+                CHAT_RELAY_MESSAGES.inc(result="decode_error")
+                logger.warning("chat_channel 메시지 JSON 디코딩 실패", extra={"error": str(e), "size": len(raw or "")})
+                continue
+            if isinstance(data, dict):
+                decoded.append(data)
+            else:
+                CHAT_RELAY_MESSAGES.inc(result="decode_error")
+        return decoded
+
+    async def dispatch(self, data: dict, received_at: float):
+        if not data.get("room"):
+            CHAT_RELAY_MESSAGES.inc(result="no_room")
+            logger.debug("room 이 없는 chat_channel 메시지 무시", extra={"keys": sorted(data)})
+            return
+        # 자리가 날 때까지 기다리므로 emit 이 밀리면 Redis 읽기도 같이 멈춘다
+        await self._slots.acquire()
+        CHAT_RELAY_INFLIGHT.inc()
+        task = asyncio.create_task(self._emit(data, received_at))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _emit(self, data: dict, received_at: float):
+        room = data.get("room")
+        try:
+            await self.sio.emit("message", data, room=room, ignore_queue=True)
+            CHAT_RELAY_MESSAGES.inc(result="delivered")
+            logger.info("Redis → Socket.IO 브로드캐스트", extra={"category": "broadcast", "room": room})
+        except Exception:
+            CHAT_RELAY_MESSAGES.inc(result="error")
+            logger.exception("Socket.IO 전달 실패", extra={"room": room})
+        finally:
+            now = time.time()
+            CHAT_RELAY_LAG.observe(now - received_at)
+            published_at = data.get("published_at")
+            if isinstance(published_at, (int, float)):
+                CHAT_RELAY_END_TO_END.observe(max(0.0, now - published_at))
+            CHAT_RELAY_INFLIGHT.dec()
+            self._slots.release()
+
+    async def drain(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+async def _read_batch(pubsub, batch_size: int) -> List[str]:
+    """메시지가 올 때까지 기다렸다가, 이미 도착해 있는 것까지 최대 batch_size 개를 모아 돌려준다"""
+    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+    if message is None:
+        return []
+    batch = [message["data"]]
+    while len(batch) < batch_size:
+        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.0)
+        if message is None:
+            break
+        batch.append(message["data"])
+    return batch
+
+
+async def run_chat_subscriber(sio, channel: str = CHAT_CHANNEL):
+    """chat_channel 을 구독해서 Socket.IO 방으로 전달 (끊기면 백오프 후 재구독)"""
+    if not settings.redis_url:
+        return
+
+    relay = ChatRelay(sio, settings.chat_relay_max_inflight)
+    backoff = _BACKOFF_INITIAL
+    while True:
+        client: Optional[aioredis.Redis] = None
+        try:
+            client = aioredis.Redis.from_url(settings.redis_url, decode_responses=True)
+            pubsub = client.pubsub()
+            await pubsub.subscribe(channel)
+            logger.info("Redis PubSub 구독 시작", extra={"channel": channel})
+            backoff = _BACKOFF_INITIAL
+
+            while True:
+                batch = await _read_batch(pubsub, settings.chat_relay_batch_size)
+                if not batch:
+                    continue
+                received_at = time.time()
+                CHAT_RELAY_BATCH_SIZE.observe(len(batch))
+                for data in relay.decode(batch):
+                    await relay.dispatch(data, received_at)
+        except asyncio.CancelledError:
+            await relay.drain()
+            raise
+        except Exception as e:
+            CHAT_RELAY_RECONNECTS.inc()
+            logger.warning("chat_channel 구독 오류, 재연결 대기", extra={"error": str(e), "backoff": backoff})
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.chat_relay_backoff_max)
+        finally:
+            if client is not None:
+                await client.aclose()
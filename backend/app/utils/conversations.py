@@ -0,0 +1,111 @@
+# app/utils/conversations.py
+"""
+conversations 테이블 갱신 로직.
+메시지 전송/읽음 처리와 같은 트랜잭션 안에서 호출해야 하며, commit 은 호출한 쪽에서 한다.
+"""
+from typing import Tuple
+
+from sqlalchemy import case, func, select, delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import Conversation, Message
+
+
+def conversation_pair(user_a: int, user_b: int) -> Tuple[int, int]:
+    return (user_a, user_b) if user_a <= user_b else (user_b, user_a)
+
+
+def _unread_column(user_id: int, low: int):
+    return Conversation.unread_count_low if user_id == low else Conversation.unread_count_high
+
+
+def record_message(db: Session, message: Message):
+    """새 메시지를 대화방의 마지막 메시지로 기록하고 받는 사람의 unread 를 1 올린다"""
+    low, high = conversation_pair(message.sender_id, message.receiver_id)
+    unread = _unread_column(message.receiver_id, low)
+    # 두 사람이 동시에 보내면 id 가 작은 쪽 트랜잭션이 나중에 커밋될 수 있으므로,
+    # 마지막 메시지는 지금보다 큰 id 일 때만 바꾼다 (UPDATE 가 행 잠금 후 최신 값으로 비교)
+    # MySQL 은 SET 을 왼쪽부터 적용하므로 last_message_at 의 CASE 는 이미 바뀐 last_message_id 를 본다
+    # → "<=" 로 비교해야 방금 넣은 id 에도 참이 된다
+    is_newer = Conversation.last_message_id.is_(None) | (Conversation.last_message_id <= message.id)
+    values = {
+        Conversation.last_message_id: case((is_newer, message.id), else_=Conversation.last_message_id),
+        Conversation.last_message_at: case((is_newer, message.timestamp), else_=Conversation.last_message_at),
+        unread: unread + 1,
+    }
+
+    updated = db.query(Conversation).filter(
+        Conversation.user_low_id == low,
+        Conversation.user_high_id == high
+    ).update(values, synchronize_session=False)
+    if updated:
+        return
+
+    # 첫 메시지: 대화방 생성 (동시에 만들어진 경우 UPDATE 로 재시도)
+    try:
+        with db.begin_nested():
+            db.add(Conversation(
+                user_low_id=low,
+                user_high_id=high,
+                last_message_id=message.id,
+                last_message_at=message.timestamp,
+                unread_count_low=1 if message.receiver_id == low else 0,
+                unread_count_high=1 if message.receiver_id != low else 0,
+            ))
+    except IntegrityError:
+        db.query(Conversation).filter(
+            Conversation.user_low_id == low,
+            Conversation.user_high_id == high
+        ).update(values, synchronize_session=False)
+
+
+def mark_conversation_read(db: Session, reader_id: int, other_user_id: int, count: int = None):
+    """reader 의 unread 를 0 으로 (count 가 주어지면 그만큼만 줄임)"""
+    low, high = conversation_pair(reader_id, other_user_id)
+    unread = _unread_column(reader_id, low)
+    new_value = 0 if count is None else case((unread > count, unread - count), else_=0)
+    db.query(Conversation).filter(
+        Conversation.user_low_id == low,
+        Conversation.user_high_id == high
+    ).update({unread: new_value}, synchronize_session=False)
+
+
+def remove_conversation(db: Session, user_a: int, user_b: int):
+    low, high = conversation_pair(user_a, user_b)
+    db.query(Conversation).filter(
+        Conversation.user_low_id == low,
+        Conversation.user_high_id == high
+    ).delete(synchronize_session=False)
+
+
+def rebuild_conversations(db: Session) -> int:
+    """messages 테이블 전체에서 conversations 를 다시 만든다 (백필/복구용)"""
+    low = case((Message.sender_id <= Message.receiver_id, Message.sender_id), else_=Message.receiver_id)
+    high = case((Message.sender_id <= Message.receiver_id, Message.receiver_id), else_=Message.sender_id)
+    unread = Message.is_read == False
+
+    pairs = select(
+        low.label("user_low_id"),
+        high.label("user_high_id"),
+        func.max(Message.id).label("last_message_id"),
+        func.sum(case((unread & (Message.receiver_id == low), 1), else_=0)).label("unread_count_low"),
+        func.sum(case((unread & (Message.receiver_id != low), 1), else_=0)).label("unread_count_high"),
+    ).group_by(low, high).subquery()
+
+    rows = select(
+        pairs.c.user_low_id,
+        pairs.c.user_high_id,
+        pairs.c.last_message_id,
+        Message.timestamp,
+        pairs.c.unread_count_low,
+        pairs.c.unread_count_high,
+    ).join(Message, Message.id == pairs.c.last_message_id)
+
+    db.execute(delete(Conversation))
+    result = db.execute(insert(Conversation).from_select(
+        ["user_low_id", "user_high_id", "last_message_id", "last_message_at",
+         "unread_count_low", "unread_count_high"],
+        rows
+    ))
+    return result.rowcount
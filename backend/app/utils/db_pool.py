@@ -0,0 +1,162 @@
+# app/utils/db_pool.py
+"""
+DB 커넥션 풀 설정과 지표.
+
+엔진 옵션은 Settings 의 db_pool_* 값으로 만들고, 풀 클래스는 QueuePool 을 감싸서
+커넥션을 꺼낼 때까지 기다린 시간, 사용 중인 커넥션 수, overflow 커넥션 생성,
+대기 시간 초과를 기록한다. /metrics/db-pool 에서 pool_metrics() 결과를 볼 수 있다.
+"""
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import settings
+from app.utils.metrics import register_collector
+
+# 커넥션 대기 시간 히스토그램 경계 (초)
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)  # 마지막 칸은 +Inf
+        self.overflow_created = 0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+
+    def count_overflow(self):
+        with self._lock:
+            self.overflow_created += 1
+
+    def count_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+
+class _MeteredPoolMixin:
+    """QueuePool 의 커넥션 획득 경로에 지표 기록을 끼워 넣는다"""
+
+    stats: PoolStats
+    pool_name: str
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.count_timeout()
+            raise
+        self.stats.observe_wait(time.perf_counter() - started)
+        return connection
+
+    def _inc_overflow(self) -> bool:
+        created = super()._inc_overflow()
+        # overflow() 가 양수면 pool_size 를 넘어서 새로 연 커넥션
+        if created and self.overflow() > 0:
+            self.stats.count_overflow()
+        return created
+
+    def recreate(self):
+        # engine.dispose() 로 풀이 새로 만들어져도 같은 지표를 이어서 쓴다
+        pool = super().recreate()
+        _attach(pool, self.pool_name, self.stats)
+        return pool
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncAdaptedQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+_pools: Dict[str, object] = {}
+
+
+def _attach(pool, name: str, stats: PoolStats):
+    pool.pool_name = name
+    pool.stats = stats
+    _pools[name] = pool
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine / create_async_engine 에 넘길 풀 옵션"""
+    if url.startswith("sqlite"):
+        # SQLite 는 SQLAlchemy 기본 풀을 그대로 사용 (테스트/로컬용)
+        return {}
+    return {
+        "poolclass": MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+def register_pool(name: str, engine):
+    """엔진의 풀을 지표 대상으로 등록 (AsyncEngine 은 sync_engine 의 풀)"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if isinstance(pool, _MeteredPoolMixin):
+        _attach(pool, name, PoolStats())
+
+
+def pool_metrics() -> List[dict]:
+    result = []
+    for name, pool in _pools.items():
+        stats = pool.stats
+        result.append({
+            "pool": name,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "checkouts": stats.checkouts,
+            "wait_seconds_total": round(stats.wait_seconds_total, 6),
+            "wait_seconds_max": round(stats.wait_seconds_max, 6),
+            "wait_seconds_buckets": dict(zip([*map(str, WAIT_BUCKETS), "+Inf"], stats.wait_buckets)),
+            "overflow_created": stats.overflow_created,
+            "timeouts": stats.timeouts,
+        })
+    return result
+
+
+@register_collector
+def _pool_families():
+    rows = pool_metrics()
+    gauges = [
+        ("db_pool_size", "풀 크기", "size"),
+        ("db_pool_checked_out", "사용 중인 커넥션 수", "checked_out"),
+        ("db_pool_idle", "풀에서 대기 중인 커넥션 수", "idle"),
+        ("db_pool_overflow", "pool_size 를 넘어 열려 있는 커넥션 수", "overflow"),
+    ]
+    for name, documentation, field in gauges:
+        yield (name, "gauge", documentation, [({"pool": row["pool"]}, row[field]) for row in rows])
+    counters = [
+        ("db_pool_checkouts_total", "커넥션을 꺼낸 횟수", "checkouts"),
+        ("db_pool_wait_seconds_total", "커넥션을 기다린 시간 합계", "wait_seconds_total"),
+        ("db_pool_overflow_created_total", "overflow 커넥션을 새로 연 횟수", "overflow_created"),
+        ("db_pool_timeouts_total", "커넥션 대기 시간 초과 횟수", "timeouts"),
+    ]
+    for name, documentation, field in counters:
+        yield (name, "counter", documentation, [({"pool": row["pool"]}, row[field]) for row in rows])
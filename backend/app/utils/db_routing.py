@@ -0,0 +1,155 @@
+# app/utils/db_routing.py
+"""
+읽기/쓰기 DB 라우팅.
+
+GET/HEAD 요청의 세션은 읽기 복제본으로 보내고, 쓰기(flush)와 그 이후의 읽기는 primary 로 보낸다.
+복제 지연 때문에 방금 쓴 내용이 안 보이는 일을 막기 위해, 쓰기를 커밋한 사용자는
+db_read_your_writes_window 초 동안 GET 요청도 primary 에서 읽는다 (read-your-writes).
+최근 쓰기 기록은 Redis 에 두어 워커 간에 공유하고, Redis 가 없으면 프로세스 내에 둔다.
+GET 이어도 없으면 만들어 쓰는 라우트는 get_primary_db 로 복제본을 건너뛴다.
+"""
+import random
+import threading
+import time
+from typing import Dict, Optional, Sequence
+
+from jose import JWTError, jwt
+from redis import RedisError
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.redis import redis_client, redis_available
+
+logger = get_logger(__name__)
+
+RECENT_WRITE_KEY = "db:recent_write:{user_id}"
+READ_METHODS = ("GET", "HEAD")
+
+# 복제본 sync URL 드라이버 → async 드라이버
+_ASYNC_DRIVERS = {
+    "mysql+pymysql": "mysql+aiomysql",
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def replica_urls():
+    return [url.strip() for url in settings.db_replica_urls.split(",") if url.strip()]
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+class RoutingSession(Session):
+    """use_replica 가 켜진 세션의 읽기만 복제본으로 보낸다"""
+
+    def __init__(self, *args, replicas: Sequence = (), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = list(replicas)
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        # bind_arguments={"bind": ...} 로 직접 지정한 bind 는 그대로 쓴다
+        explicit = kwargs.get("bind") is not None
+        if not explicit and self.replicas and self.info.get("use_replica") and not self._flushing:
+            return random.choice(self.replicas)
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def primary_bind(session: Session, mapper=None):
+    """복제본 라우팅을 건너뛴 primary bind (오래 캐시할 값을 복제 지연 없이 읽을 때)"""
+    return Session.get_bind(session, mapper=mapper)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _stick_to_primary(session: Session, flush_context):
+    # 한 번 쓰기 시작한 세션은 이후 읽기도 primary 에서 (자기 쓰기가 보이도록)
+    session.info["use_replica"] = False
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session: Session):
+    if session.info.pop("wrote", False) and session.info.get("user_id") is not None:
+        mark_recent_write(session.info["user_id"])
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _forget_write(session: Session):
+    session.info.pop("wrote", None)
+
+
+class _MemoryRecentWrites:
+    def __init__(self):
+        self._until: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: int, window: float):
+        with self._lock:
+            now = time.monotonic()
+            if len(self._until) > 10000:
+                self._until = {uid: until for uid, until in self._until.items() if until > now}
+            self._until[user_id] = now + window
+
+    def check(self, user_id: int) -> bool:
+        with self._lock:
+            return self._until.get(user_id, 0) > time.monotonic()
+
+
+_memory_recent_writes = _MemoryRecentWrites()
+
+
+def mark_recent_write(user_id: int):
+    window = settings.db_read_your_writes_window
+    _memory_recent_writes.mark(user_id, window)
+    if not redis_available():
+        return
+    try:
+        redis_client.set(RECENT_WRITE_KEY.format(user_id=user_id), 1, px=int(window * 1000))
+    except RedisError as e:
+        logger.error("최근 쓰기 기록 실패", extra={"user_id": user_id, "error": str(e)})
+
+
+def wrote_recently(user_id: int) -> bool:
+    if _memory_recent_writes.check(user_id):
+        return True
+    if not redis_available():
+        return False
+    try:
+        return bool(redis_client.exists(RECENT_WRITE_KEY.format(user_id=user_id)))
+    except RedisError:
+        # 확인할 수 없으면 안전하게 primary
+        return True
+
+
+def request_user_id(conn: HTTPConnection) -> Optional[int]:
+    """Authorization 헤더의 토큰에서 user_id (검증 실패 시 None, 인증 자체는 get_current_user 가 담당)"""
+    authorization = conn.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    from app.utils.auth_cache import token_cache  # auth_cache → models → database 순환 import 방지
+
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+    try:
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+    except JWTError:
+        return None
+    return payload.get("user_id")
+
+
+def route_session(session: Session, conn: HTTPConnection, primary: bool = False):
+    """요청 정보를 보고 세션의 읽기 대상을 정한다 (primary=True 면 GET 이어도 primary)"""
+    user_id = request_user_id(conn)
+    session.info["user_id"] = user_id
+    read_only = conn.scope.get("method") in READ_METHODS and not primary
+    session.info["use_replica"] = read_only and not (user_id is not None and wrote_recently(user_id))
@@ -0,0 +1,53 @@
+# app/utils/follow_counts.py
+"""
+users.follower_count / users.following_count 갱신 로직.
+팔로우 추가/삭제와 같은 트랜잭션 안에서 호출해야 하며, commit 은 호출한 쪽에서 한다.
+"""
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Follow, User
+from app.utils.auth_cache import invalidate_user_on_commit
+
+
+def _shift(column, delta: int):
+    # 음수로 내려가지 않도록 (이미 어긋난 값이 있어도 0 에서 멈춤)
+    if delta >= 0:
+        return column + delta
+    return case((column + delta > 0, column + delta), else_=0)
+
+
+def apply_follow_delta(db: Session, follower_id: int, following_id: int, delta: int):
+    """follow 는 delta=1, unfollow 는 delta=-1"""
+    db.query(User).filter(User.id == follower_id).update(
+        {User.following_count: _shift(User.following_count, delta)}, synchronize_session=False
+    )
+    db.query(User).filter(User.id == following_id).update(
+        {User.follower_count: _shift(User.follower_count, delta)}, synchronize_session=False
+    )
+    # 벌크 UPDATE 는 ORM 이벤트가 없으므로 인증 캐시에 들고 있는 카운트를 직접 무효화
+    invalidate_user_on_commit(db, follower_id)
+    invalidate_user_on_commit(db, following_id)
+
+
+def reconcile_follow_counts(db: Session) -> int:
+    """follows 테이블 기준으로 카운터를 다시 계산하고, 값이 달랐던 사용자 수를 돌려준다"""
+    followers = (
+        select(func.count(Follow.id))
+        .where(Follow.following_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    following = (
+        select(func.count(Follow.id))
+        .where(Follow.follower_id == User.id)
+        .correlate(User)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(User)
+        .where((User.follower_count != followers) | (User.following_count != following))
+        .values(follower_count=followers, following_count=following)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
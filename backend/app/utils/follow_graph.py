@@ -0,0 +1,208 @@
+# app/utils/follow_graph.py
+"""
+팔로우 관계 조회.
+
+- mutual_follows_query: DB 에서 상호 팔로우를 한 번의 self-join 으로 계산
+- follow_graph: 사용자별 팔로잉/팔로워 id 를 정렬된 int 배열로 메모리에 들고 있는 캐시.
+  toggle_follow 에서 증분 갱신하고, Redis pub/sub 으로 다른 워커에도 같은 변경을 전파한다.
+  만료 없이 들고 있으므로 인접 목록은 복제본이 아닌 primary 에서 읽는다
+  (복제 지연 중에 읽은 목록이 캐시되면 다음 변경 전까지 계속 틀린 값이 나간다).
+"""
+import asyncio
+import json
+import threading
+import uuid
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import List
+
+import redis.asyncio as aioredis
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.models import Follow, User
+from app.utils.db_routing import primary_bind
+from app.utils.publisher import publish
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+FOLLOW_GRAPH_CHANNEL = "follow_graph"
+
+# 이 워커에서 발행한 변경은 구독 시 다시 적용하지 않도록 구분
+WORKER_ID = uuid.uuid4().hex
+
+
+def mutual_follows_query(db: Session, user_id: int):
+    """user_id 와 서로 팔로우하는 사용자 쿼리 (follows self-join 한 번)"""
+    outgoing = aliased(Follow)  # user_id → 상대
+    incoming = aliased(Follow)  # 상대 → user_id
+    return (
+        db.query(User)
+        .join(outgoing, and_(outgoing.follower_id == user_id, outgoing.following_id == User.id))
+        .join(incoming, and_(incoming.follower_id == User.id, incoming.following_id == user_id))
+        .filter(User.id != user_id)
+        .distinct()
+    )
+
+
+class _AdjacencyCache:
+    """user_id → 정렬된 array('i') 의 LRU 캐시"""
+
+    def __init__(self, max_users: int):
+        self.max_users = max_users
+        self._entries: "OrderedDict[int, array]" = OrderedDict()
+
+    def get(self, user_id: int):
+        ids = self._entries.get(user_id)
+        if ids is not None:
+            self._entries.move_to_end(user_id)
+        return ids
+
+    def put(self, user_id: int, ids: array):
+        self._entries[user_id] = ids
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def add_edge(self, user_id: int, other_id: int):
+        ids = self._entries.get(user_id)
+        if ids is None:
+            return
+        index = bisect_left(ids, other_id)
+        if index == len(ids) or ids[index] != other_id:
+            ids.insert(index, other_id)
+
+    def remove_edge(self, user_id: int, other_id: int):
+        ids = self._entries.get(user_id)
+        if ids is None:
+            return
+        index = bisect_left(ids, other_id)
+        if index < len(ids) and ids[index] == other_id:
+            del ids[index]
+
+    def pop(self, user_id: int):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class FollowGraph:
+    def __init__(self, max_users: int):
+        self._following = _AdjacencyCache(max_users)  # follower → 팔로우하는 사람들
+        self._followers = _AdjacencyCache(max_users)  # following → 팔로워들
+        self._lock = threading.Lock()
+        # 로딩 중에 변경이 들어오면 그 결과는 캐시하지 않기 위한 세대 번호
+        self._generation = 0
+
+    def _load(self, db: Session, cache: _AdjacencyCache, user_id: int, key_column, value_column) -> array:
+        with self._lock:
+            ids = cache.get(user_id)
+            if ids is not None:
+                return ids
+            generation = self._generation
+
+        rows = db.execute(
+            select(value_column).where(key_column == user_id),
+            bind_arguments={"bind": primary_bind(db, Follow)},
+        ).all()
+        ids = array("i", sorted({row[0] for row in rows}))
+
+        with self._lock:
+            if generation == self._generation:
+                cache.put(user_id, ids)
+        return ids
+
+    def following(self, db: Session, user_id: int) -> array:
+        return self._load(db, self._following, user_id, Follow.follower_id, Follow.following_id)
+
+    def followers(self, db: Session, user_id: int) -> array:
+        return self._load(db, self._followers, user_id, Follow.following_id, Follow.follower_id)
+
+    def following_count(self, db: Session, user_id: int) -> int:
+        return len(self.following(db, user_id))
+
+    def follower_count(self, db: Session, user_id: int) -> int:
+        return len(self.followers(db, user_id))
+
+    def is_following(self, db: Session, follower_id: int, following_id: int) -> bool:
+        ids = self.following(db, follower_id)
+        index = bisect_left(ids, following_id)
+        return index < len(ids) and ids[index] == following_id
+
+    def mutual_ids(self, db: Session, user_id: int) -> List[int]:
+        """서로 팔로우하는 사용자 id (오름차순)"""
+        following = self.following(db, user_id)
+        followers = self.followers(db, user_id)
+        small, large = (following, followers) if len(following) <= len(followers) else (followers, following)
+        return sorted(set(small).intersection(large).difference((user_id,)))
+
+    def apply(self, op: str, follower_id: int, following_id: int):
+        """이미 메모리에 올라와 있는 인접 목록에만 변경을 반영"""
+        with self._lock:
+            self._generation += 1
+            if op == "follow":
+                self._following.add_edge(follower_id, following_id)
+                self._followers.add_edge(following_id, follower_id)
+            elif op == "unfollow":
+                self._following.remove_edge(follower_id, following_id)
+                self._followers.remove_edge(following_id, follower_id)
+
+    def invalidate(self, user_id: int = None):
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._following.clear()
+                self._followers.clear()
+            else:
+                self._following.pop(user_id)
+                self._followers.pop(user_id)
+
+    def record(self, op: str, follower_id: int, following_id: int):
+        """toggle_follow 커밋 후 호출: 로컬 반영 + 다른 워커에 전파"""
+        self.apply(op, follower_id, following_id)
+        # 실패 시 재시도/dead-letter 는 publisher 가 처리
+        publish(FOLLOW_GRAPH_CHANNEL, json.dumps({
+            "op": op,
+            "follower_id": follower_id,
+            "following_id": following_id,
+            "origin": WORKER_ID,
+        }))
+
+
+follow_graph = FollowGraph(settings.follow_graph_max_users)
+
+
+async def listen_for_changes():
+    """다른 워커의 팔로우 변경을 구독해서 로컬 캐시에 반영 (앱 수명 동안 실행)"""
+    if not settings.redis_url:
+        return
+
+    while True:
+        client = aioredis.Redis.from_url(settings.redis_url, decode_responses=True)
+        try:
+            pubsub = client.pubsub()
+            await pubsub.subscribe(FOLLOW_GRAPH_CHANNEL)
+            # 구독이 끊겨 있던 동안의 변경은 알 수 없으므로 전부 다시 로드
+            follow_graph.invalidate()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                event = json.loads(message["data"])
+                if event.get("origin") == WORKER_ID:
+                    continue
+                if event.get("op") == "invalidate":
+                    follow_graph.invalidate(event.get("user_id"))
+                else:
+                    follow_graph.apply(event["op"], event["follower_id"], event["following_id"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning("팔로우 그래프 구독 오류, 재연결 대기", extra={"error": str(e)})
+            follow_graph.invalidate()
+            await asyncio.sleep(5)
+        finally:
+            await client.aclose()
@@ -0,0 +1,235 @@
+# app/utils/like_counter.py
+"""
+게시글 좋아요 수를 원자적 카운터(Redis INCRBY, 없으면 프로세스 내 카운터)에 보관하고
+백그라운드 flusher 가 변경된 게시글만 모아서 posts.likes 에 일괄 반영한다 (write-behind).
+
+카운터는 두 개를 둔다: 화면에 보여 줄 전체 값과, 아직 DB 에 반영하지 않은 delta.
+flusher 는 delta 를 원자적으로 꺼내서 posts.likes = posts.likes + delta 로 더하므로
+여러 워커의 flusher 가 순서가 뒤바뀌어 실행돼도 새 값을 옛 값으로 덮어쓰지 않는다.
+
+Redis 에 더하지 못하면 posts.likes 에 바로 더하고 그 delta 를 기억해 둔다.
+Redis 가 돌아오면 이미 있는 카운터에 같은 delta 를 더한다
+(카운터가 없으면 다음 좋아요 때 delta 가 들어간 posts.likes 로 시작하므로 그대로 둔다).
+"""
+import asyncio
+import threading
+from typing import Dict, Iterable
+
+from redis import RedisError
+from sqlalchemy import bindparam, case, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Post
+from app.utils.redis import redis_client, redis_available
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+LIKE_COUNT_KEY = "post:likes:{post_id}"
+LIKE_DELTA_KEY = "post:likes:delta:{post_id}"
+DIRTY_KEY = "post:likes:dirty"
+
+
+class RedisLikeCounter:
+    def __init__(self, client):
+        self.client = client
+
+    def add(self, post_id: int, delta: int, seed: int) -> int:
+        key = LIKE_COUNT_KEY.format(post_id=post_id)
+        pipe = self.client.pipeline()
+        # 처음 보는 게시글이면 DB 값으로 시작
+        pipe.set(key, seed, nx=True)
+        pipe.incrby(key, delta)
+        pipe.incrby(LIKE_DELTA_KEY.format(post_id=post_id), delta)
+        pipe.sadd(DIRTY_KEY, post_id)
+        _, count, _, _ = pipe.execute()
+        return max(int(count), 0)
+
+    def get_many(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        post_ids = list(post_ids)
+        if not post_ids:
+            return {}
+        values = self.client.mget([LIKE_COUNT_KEY.format(post_id=pid) for pid in post_ids])
+        return {pid: max(int(v), 0) for pid, v in zip(post_ids, values) if v is not None}
+
+    def drain_deltas(self, batch: int) -> Dict[int, int]:
+        """변경된 게시글의 delta 를 꺼내고 0 으로 되돌린다 (GET + DEL 을 MULTI 로 묶어 원자적으로)"""
+        post_ids = [int(v) for v in (self.client.spop(DIRTY_KEY, batch) or [])]
+        if not post_ids:
+            return {}
+        pipe = self.client.pipeline()
+        for pid in post_ids:
+            key = LIKE_DELTA_KEY.format(post_id=pid)
+            pipe.get(key)
+            pipe.delete(key)
+        values = pipe.execute()[::2]
+        return {pid: int(v) for pid, v in zip(post_ids, values) if v is not None and int(v)}
+
+    def restore_deltas(self, deltas: Dict[int, int]):
+        """반영에 실패한 delta 를 되돌린다 (그 사이 들어온 delta 에 더해짐)"""
+        if not deltas:
+            return
+        pipe = self.client.pipeline()
+        for pid, delta in deltas.items():
+            pipe.incrby(LIKE_DELTA_KEY.format(post_id=pid), delta)
+        pipe.sadd(DIRTY_KEY, *deltas)
+        pipe.execute()
+
+    def add_existing(self, deltas: Dict[int, int]):
+        """이미 있는 카운터에만 delta 를 더한다 (카운터는 만료되지 않으므로 확인 후 더해도 안전)"""
+        post_ids = list(deltas)
+        values = self.client.mget([LIKE_COUNT_KEY.format(post_id=pid) for pid in post_ids])
+        existing = [pid for pid, value in zip(post_ids, values) if value is not None]
+        if not existing:
+            return
+        pipe = self.client.pipeline()
+        for pid in existing:
+            pipe.incrby(LIKE_COUNT_KEY.format(post_id=pid), deltas[pid])
+        pipe.sadd(DIRTY_KEY, *existing)
+        pipe.execute()
+
+
+class MemoryLikeCounter:
+    """Redis 가 없을 때 쓰는 프로세스 내 카운터"""
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self._deltas: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, post_id: int, delta: int, seed: int) -> int:
+        with self._lock:
+            count = self._counts.get(post_id, seed) + delta
+            self._counts[post_id] = count
+            self._deltas[post_id] = self._deltas.get(post_id, 0) + delta
+            return max(count, 0)
+
+    def get_many(self, post_ids: Iterable[int]) -> Dict[int, int]:
+        with self._lock:
+            return {pid: max(self._counts[pid], 0) for pid in post_ids if pid in self._counts}
+
+    def drain_deltas(self, batch: int) -> Dict[int, int]:
+        with self._lock:
+            post_ids = list(self._deltas)[:batch]
+            deltas = {pid: self._deltas.pop(pid) for pid in post_ids}
+            return {pid: delta for pid, delta in deltas.items() if delta}
+
+    def restore_deltas(self, deltas: Dict[int, int]):
+        with self._lock:
+            for pid, delta in deltas.items():
+                self._deltas[pid] = self._deltas.get(pid, 0) + delta
+
+
+_memory_counter = MemoryLikeCounter()
+_redis_counter = RedisLikeCounter(redis_client)
+
+
+# Redis 대신 posts.likes 에 바로 더한 delta (Redis 카운터에는 아직 빠져 있음)
+_pending_deltas: Dict[int, int] = {}
+_pending_lock = threading.Lock()
+
+
+def get_like_counter():
+    return _redis_counter if redis_available() else _memory_counter
+
+
+def _replay_pending_deltas():
+    """posts.likes 에만 더한 delta 를 Redis 카운터에도 더한다 (Redis 가 아직 안 되면 RedisError)"""
+    with _pending_lock:
+        pending = dict(_pending_deltas)
+    if not pending:
+        return
+    _redis_counter.add_existing(pending)
+    with _pending_lock:
+        for pid, delta in pending.items():
+            remaining = _pending_deltas.get(pid, 0) - delta
+            if remaining:
+                _pending_deltas[pid] = remaining
+            else:
+                _pending_deltas.pop(pid, None)
+
+
+def _clamped_likes(delta):
+    return case((Post.likes + delta > 0, Post.likes + delta), else_=0)
+
+
+def add_like(db: Session, post: Post, delta: int) -> int:
+    """post_likes 를 커밋한 뒤 호출: 좋아요 수에 delta 를 더하고 새 값을 돌려준다"""
+    if not settings.redis_url:
+        return _memory_counter.add(post.id, delta, seed=post.likes or 0)
+    try:
+        _replay_pending_deltas()
+        return _redis_counter.add(post.id, delta, seed=post.likes or 0)
+    except RedisError as e:
+        # 좋아요 기록은 이미 커밋됐으므로 카운터가 뒤처지지 않게 DB 에 바로 반영
+        logger.warning("Redis 좋아요 카운터 실패, posts.likes 에 직접 반영", extra={
+            "post_id": post.id, "delta": delta, "error": str(e),
+        })
+        db.execute(
+            update(Post)
+            .where(Post.id == post.id)
+            .values(likes=_clamped_likes(delta))
+        )
+        db.commit()
+        with _pending_lock:
+            _pending_deltas[post.id] = _pending_deltas.get(post.id, 0) + delta
+        return db.scalar(select(Post.likes).where(Post.id == post.id)) or 0
+
+
+def like_counts(post_ids: Iterable[int]) -> Dict[int, int]:
+    """아직 DB 에 반영되지 않았을 수 있는 최신 좋아요 수 (카운터에 없는 게시글은 빠짐)"""
+    try:
+        return get_like_counter().get_many(post_ids)
+    except RedisError:
+        return {}
+
+
+def flush_like_counts(batch: int) -> int:
+    """쌓인 delta 를 posts.likes 에 일괄 UPDATE. 꺼낸 게시글 수를 반환"""
+    counter = get_like_counter()
+    if counter is _redis_counter:
+        # Redis 장애 동안 posts.likes 에만 더한 delta 를 화면용 카운터에도 넣는다
+        _replay_pending_deltas()
+    deltas = counter.drain_deltas(batch)
+    if not deltas:
+        return 0
+
+    posts = Post.__table__
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(posts)
+            .where(posts.c.id == bindparam("post_id"))
+            .values(likes=_clamped_likes(bindparam("delta"))),
+            [{"post_id": pid, "delta": delta} for pid, delta in deltas.items()],
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        # 다음 주기에 다시 시도
+        counter.restore_deltas(deltas)
+        raise
+    finally:
+        db.close()
+    return len(deltas)
+
+
+async def _flush_all():
+    while await asyncio.to_thread(flush_like_counts, settings.like_flush_batch) == settings.like_flush_batch:
+        pass
+
+
+async def run_like_flusher():
+    """앱 수명 동안 주기적으로 좋아요 수를 DB 로 내려 쓰는 백그라운드 작업"""
+    while True:
+        try:
+            await asyncio.sleep(settings.like_flush_interval)
+            await _flush_all()
+        except asyncio.CancelledError:
+            # 종료 직전에 남은 변경분을 반영
+            await _flush_all()
+            raise
+        except Exception:
+            logger.exception("좋아요 수 반영 실패")
@@ -0,0 +1,178 @@
+# app/utils/log.py
+"""
+구조화 로그 (한 줄 JSON), 카테고리별 샘플링, 큐 기반 출력.
+
+    log = get_logger(__name__)
+    log.info("room joined", extra={"category": "socketio", "sid": sid, "room": room})
+
+요청 경로에서는 레코드를 큐에 넣기만 하고, 포맷/출력은 QueueListener 스레드가 한다.
+큐가 가득 차면 기다리지 않고 버린 뒤 개수만 센다. WARNING 미만 레코드는
+settings.log_sample_rates 에 적힌 카테고리 비율만큼만 남긴다.
+토큰/비밀번호 같은 값은 출력 전에 가린다.
+"""
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from app.config import settings
+
+ROOT_LOGGER = "app"
+REDACTED = "[REDACTED]"
+
+# 이 이름의 extra 필드/딕셔너리 키는 값 전체를 가린다
+SECRET_KEYS = {"token", "access_token", "refresh_token", "password", "authorization", "jwt", "secret"}
+# 메시지 안에 섞여 들어간 JWT / Bearer 토큰
+_JWT_RE = re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]+")
+_BEARER_RE = re.compile(r"(?i)\bbearer\s+[\w.~+/-]+=*")
+
+# LogRecord 기본 속성 (이 외의 속성은 extra 로 들어온 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["DroppingQueueHandler"] = None
+
+
+def redact(value):
+    """문자열 속 토큰과 비밀 키 값을 가린 사본을 돌려준다"""
+    if isinstance(value, str):
+        return _BEARER_RE.sub("Bearer " + REDACTED, _JWT_RE.sub(REDACTED, value))
+    if isinstance(value, dict):
+        return {
+            k: REDACTED if str(k).lower() in SECRET_KEYS else redact(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    return value
+
+
+def parse_sample_rates(raw: str) -> Dict[str, float]:
+    """"socketio=0.1,broadcast=0.01" -> {"socketio": 0.1, "broadcast": 0.01}"""
+    rates = {}
+    for item in raw.split(","):
+        if "=" not in item:
+            continue
+        category, rate = item.split("=", 1)
+        rates[category.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """WARNING 미만 레코드를 category 별 비율로 샘플링 (category 가 없거나 미설정이면 모두 통과)"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(getattr(record, "category", None))
+        if rate is None:
+            return True
+        record.sample_rate = rate
+        return random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차면 요청을 막지 않고 버린다 (버린 수는 dropped)"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # 메시지 합치기만 하고 포맷/가리기는 리스너 스레드에서
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """json: 한 줄 JSON / text: 사람이 읽는 한 줄 (개발용)"""
+
+    def __init__(self, fmt: str = "json"):
+        super().__init__()
+        self.fmt = fmt
+
+    def format(self, record):
+        fields = {
+            key: REDACTED if key.lower() in SECRET_KEYS else redact(value)
+            for key, value in vars(record).items()
+            if key not in _RECORD_ATTRS
+        }
+        message = redact(record.getMessage())
+        if self.fmt == "text":
+            extra = " ".join(f"{k}={v}" for k, v in fields.items())
+            line = f"{self.formatTime(record)} {record.levelname:<7} {record.name} {message} {extra}".rstrip()
+            return f"{line}\n{record.exc_text}" if record.exc_text else line
+
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": message,
+            **fields,
+        }
+        if record.exc_text:
+            payload["exc"] = redact(record.exc_text)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """app.* 아래 로거 (모듈에서 get_logger(__name__) 로 사용)"""
+    return logging.getLogger(name if name.startswith(ROOT_LOGGER) else f"{ROOT_LOGGER}.{name}")
+
+
+def setup_logging():
+    """app 로거에 큐 핸들러를 달고 출력 스레드를 시작 (여러 번 불러도 한 번만)"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(StructuredFormatter(settings.log_format))
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    _queue_handler.addFilter(SamplingFilter(parse_sample_rates(settings.log_sample_rates)))
+
+    root = logging.getLogger(ROOT_LOGGER)
+    root.setLevel(settings.log_level.upper())
+    root.addHandler(_queue_handler)
+    root.propagate = False
+
+    _listener = QueueListener(_queue_handler.queue, stream)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 쓰고 출력 스레드를 멈춘다"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    root = logging.getLogger(ROOT_LOGGER)
+    if _queue_handler is not None:
+        root.removeHandler(_queue_handler)
+        if _queue_handler.dropped:
+            print(f"⚠️ 로그 큐가 가득 차 {_queue_handler.dropped}건을 버렸습니다.", file=sys.stderr)
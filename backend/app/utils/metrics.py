@@ -0,0 +1,250 @@
+# app/utils/metrics.py
+"""
+Prometheus 텍스트 형식 지표 (워커 프로세스마다 따로 집계, /metrics 에서 노출).
+
+    REQUEST_LATENCY.observe(0.12, method="GET", route="/feed/home", status="200")
+    SOCKETIO_CONNECTIONS.inc()
+
+요청 시점에 값을 쌓는 Counter / Gauge / Histogram 과, 긁어갈 때 현재 상태를 계산하는
+collector 함수 (register_collector) 두 가지를 지원한다.
+"""
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# 요청/쿼리/Redis 지연 히스토그램 기본 경계 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_registry: List["_Metric"] = []
+_collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Tuple[dict, float]]]]]] = []
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{key}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def value(self, **labels) -> float:
+        """현재 값 (Counter / Gauge, 기록이 없으면 0)"""
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> List[Tuple[str, dict, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0, 0.0]  # 버킷, count, sum
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][index] += 1
+                    break
+            entry[1] += 1
+            entry[2] += value
+
+    def samples(self):
+        result = []
+        with self._lock:
+            for key, (counts, count, total) in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    result.append((f"{self.name}_bucket", {**labels, "le": _format_value(float(bound))}, cumulative))
+                result.append((f"{self.name}_bucket", {**labels, "le": "+Inf"}, count))
+                result.append((f"{self.name}_count", labels, count))
+                result.append((f"{self.name}_sum", labels, total))
+        return result
+
+
+def register_collector(collector: Callable[[], Iterable[Tuple[str, str, str, List[Tuple[dict, float]]]]]):
+    """collector() 는 (이름, 타입, 설명, [(labels, 값), ...]) 를 돌려준다 (긁어갈 때마다 호출)"""
+    _collectors.append(collector)
+    return collector
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for collector in _collectors:
+        try:
+            families = list(collector())
+        except Exception as e:
+            logger.exception("지표 수집 실패", extra={
+                "collector": getattr(collector, "__name__", str(collector)), "error": str(e),
+            })
+            continue
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def room_size_families(prefix: str, sizes: Dict[str, int], **labels):
+    """방(room) 이름 -> 인원 수 에서 방 개수 / 총 인원 / 최대 인원 지표를 만든다 (방 이름은 라벨로 쓰지 않음)"""
+    yield (f"{prefix}_rooms", "gauge", "인원이 있는 방 수", [(labels, sum(1 for n in sizes.values() if n))])
+    yield (f"{prefix}_room_members", "gauge", "방 인원 합계", [(labels, sum(sizes.values()))])
+    yield (f"{prefix}_room_size_max", "gauge", "가장 큰 방의 인원", [(labels, max(sizes.values(), default=0))])
+
+
+# ------------------------------
+# 공통 지표
+# ------------------------------
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+)
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수")
+
+DB_STATEMENT_LATENCY = Histogram(
+    "db_statement_duration_seconds", "SQL 문 실행 시간", ("engine",), buckets=DB_BUCKETS
+)
+
+REDIS_PUBLISH_LATENCY = Histogram("redis_publish_duration_seconds", "Redis PUBLISH 지연", ("channel",))
+REDIS_PUBLISH_FAILURES = Counter("redis_publish_failures_total", "Redis PUBLISH 실패 수", ("channel",))
+REDIS_PUBLISH_RETRIES = Counter("redis_publish_retries_total", "다시 보내려고 버퍼에 되돌린 PUBLISH 수")
+REDIS_PUBLISH_DEAD_LETTERS = Counter(
+    "redis_publish_dead_letters_total", "보내지 못하고 dead-letter 로 옮긴 PUBLISH 수", ("reason",)
+)
+
+SOCKETIO_CONNECTIONS = Gauge("socketio_connections", "연결된 Socket.IO 클라이언트 수")
+WEBSOCKET_CONNECTIONS = Gauge("websocket_connections", "연결된 WebSocket 수", ("endpoint",))
+
+GO_WS_SENT = Counter("go_ws_sent_total", "Go 서버로 보낸 메시지 수")
+GO_WS_DROPPED = Counter("go_ws_dropped_total", "Go 서버로 보내지 못하고 버린 메시지 수", ("reason",))
+GO_WS_RECONNECTS = Counter("go_ws_reconnects_total", "Go 서버 재연결 횟수")
+GO_WS_CONNECTED = Gauge("go_ws_connected", "Go 서버와 열려 있는 WebSocket 수")
+WEBSOCKET_SEND_DROPPED = Counter(
+    "websocket_send_dropped_total", "느린 클라이언트라서 버린 WebSocket 메시지 수", ("endpoint", "reason")
+)
+WEBSOCKET_SLOW_DISCONNECTS = Counter(
+    "websocket_slow_disconnects_total", "느린 클라이언트라서 끊은 WebSocket 연결 수", ("endpoint", "reason")
+)
+
+CHAT_RELAY_MESSAGES = Counter("chat_relay_messages_total", "chat_channel → Socket.IO 처리 결과", ("result",))
+CHAT_RELAY_LAG = Histogram("chat_relay_lag_seconds", "chat_channel 수신부터 Socket.IO emit 완료까지")
+CHAT_RELAY_END_TO_END = Histogram("chat_relay_end_to_end_seconds", "published_at 부터 Socket.IO emit 완료까지")
+CHAT_RELAY_BATCH_SIZE = Histogram(
+    "chat_relay_batch_size", "한 번에 꺼낸 chat_channel 메시지 수", buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+CHAT_RELAY_INFLIGHT = Gauge("chat_relay_inflight", "진행 중인 Socket.IO emit 수")
+CHAT_RELAY_RECONNECTS = Counter("chat_relay_reconnects_total", "chat_channel 재구독 횟수")
+
+
+class MetricsMiddleware:
+    """라우트별 지연 히스토그램과 처리 중 요청 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                # 경로 파라미터가 라벨 수를 늘리지 않도록 라우트 템플릿 사용
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
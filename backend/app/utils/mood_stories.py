@@ -0,0 +1,164 @@
+# app/utils/mood_stories.py
+"""
+무드 스토리 트레이 (팔로우한 사람들 + 본인의 최신 무드).
+
+사용자별 최신 무드는 윈도 함수 한 번으로, 프로필은 한 번의 배치 조회로 가져온다.
+만들어진 트레이는 보는 사람 기준으로 짧은 TTL 동안 캐시하고,
+무드가 새로 작성되면 작성자와 그 팔로워들의 캐시를 지운다.
+"""
+import json
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from redis import RedisError
+from sqlalchemy import desc, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import BasicInfo, Mood, User
+from app.utils.follow_graph import follow_graph
+from app.utils.redis import redis_client, redis_available
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+MOOD_STORIES_KEY = "mood:stories:{user_id}"
+
+
+class RedisStoriesCache:
+    def __init__(self, client, ttl: int):
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, user_id: int) -> Optional[List[dict]]:
+        value = self.client.get(MOOD_STORIES_KEY.format(user_id=user_id))
+        return json.loads(value) if value is not None else None
+
+    def set(self, user_id: int, stories: List[dict]):
+        self.client.set(MOOD_STORIES_KEY.format(user_id=user_id), json.dumps(stories), ex=self.ttl)
+
+    def delete(self, user_ids: Iterable[int]):
+        keys = [MOOD_STORIES_KEY.format(user_id=user_id) for user_id in user_ids]
+        pipe = self.client.pipeline(transaction=False)
+        # 팔로워가 많은 작성자도 명령 하나가 너무 커지지 않도록 나눠서 삭제
+        for start in range(0, len(keys), 1000):
+            pipe.delete(*keys[start:start + 1000])
+        pipe.execute()
+
+
+class MemoryStoriesCache:
+    """Redis 가 없을 때 쓰는 프로세스 내 캐시 (워커 간 공유되지 않음)"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._entries: Dict[int, Tuple[float, List[dict]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[List[dict]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, stories = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return stories
+
+    def set(self, user_id: int, stories: List[dict]):
+        with self._lock:
+            # 만료된 항목은 쓰기 때 같이 정리
+            now = time.monotonic()
+            for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[key]
+            self._entries[user_id] = (now + self.ttl, stories)
+
+    def delete(self, user_ids: Iterable[int]):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+
+
+_memory_cache = MemoryStoriesCache(settings.mood_stories_cache_ttl)
+_redis_cache = RedisStoriesCache(redis_client, settings.mood_stories_cache_ttl)
+
+
+def get_stories_cache():
+    return _redis_cache if redis_available() else _memory_cache
+
+
+def build_mood_stories(db: Session, viewer_id: int) -> List[dict]:
+    # 팔로우한 사람들 + 나
+    user_ids = [uid for uid in follow_graph.following(db, viewer_id) if uid != viewer_id] + [viewer_id]
+
+    # 사용자별 최신 무드 1개 (MySQL 8 / PostgreSQL 모두 지원하는 ROW_NUMBER)
+    ranked = (
+        db.query(
+            Mood.user_id,
+            Mood.emoji,
+            Mood.memo,
+            Mood.created_at,
+            func.row_number().over(
+                partition_by=Mood.user_id,
+                order_by=(desc(Mood.created_at), desc(Mood.id)),
+            ).label("rn"),
+        )
+        .filter(Mood.user_id.in_(user_ids))
+        .subquery()
+    )
+    moods = db.query(ranked.c.user_id, ranked.c.emoji, ranked.c.memo, ranked.c.created_at).filter(ranked.c.rn == 1).all()
+    mood_map = {m.user_id: m for m in moods}
+
+    profiles = (
+        db.query(User.id, User.nickname, BasicInfo.image_url)
+        .outerjoin(BasicInfo, BasicInfo.user_id == User.id)
+        .filter(User.id.in_(user_ids))
+        .all()
+    )
+    profile_map = {p.id: p for p in profiles}
+
+    result = []
+    for uid in user_ids:
+        profile = profile_map.get(uid)
+        mood = mood_map.get(uid)
+
+        result.append({
+            "id": uid,
+            "nickname": profile.nickname if profile else "",
+            "image_url": profile.image_url if profile else None,
+            "recentMood": {
+                "emoji": mood.emoji,
+                "phrase": mood.memo or "",
+                "created_at": mood.created_at.isoformat() if mood.created_at else None
+            } if mood else None
+        })
+    return result
+
+
+def load_mood_stories(db: Session, viewer_id: int) -> List[dict]:
+    cache = get_stories_cache()
+    try:
+        cached = cache.get(viewer_id)
+        if cached is not None:
+            return cached
+    except RedisError as e:
+        logger.error("무드 스토리 캐시 조회 실패", extra={"user_id": viewer_id, "error": str(e)})
+        cache = None
+
+    stories = build_mood_stories(db, viewer_id)
+    if cache is not None:
+        try:
+            cache.set(viewer_id, stories)
+        except RedisError as e:
+            logger.error("무드 스토리 캐시 저장 실패", extra={"user_id": viewer_id, "error": str(e)})
+    return stories
+
+
+def invalidate_mood_stories(db: Session, author_id: int):
+    """author 의 새 무드가 보이는 트레이 (본인 + 팔로워들) 캐시를 지운다"""
+    try:
+        get_stories_cache().delete([author_id, *follow_graph.followers(db, author_id)])
+    except RedisError as e:
+        # 캐시는 TTL 이 지나면 사라지므로 무드 작성은 실패시키지 않음
+        logger.error("무드 스토리 캐시 무효화 실패", extra={"author_id": author_id, "error": str(e)})
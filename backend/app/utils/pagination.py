@@ -0,0 +1,28 @@
+# app/utils/pagination.py
+import base64
+from typing import List, Optional
+
+from fastapi import HTTPException
+
+# 다음 페이지 커서는 응답 헤더로 내려준다 (본문은 기존 리스트 형태 유지)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*parts) -> str:
+    """키셋 페이지네이션 값들을 클라이언트가 해석할 필요 없는 불투명 문자열로 인코딩"""
+    raw = ",".join(str(p) for p in parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[str]]:
+    """encode_cursor 로 만든 커서를 원래 값 목록으로 복원 (잘못된 커서는 400)"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = base64.urlsafe_b64decode(padded.encode()).decode().split(",")
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(parts) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return parts
@@ -0,0 +1,197 @@
+# app/utils/publisher.py
+"""
+요청 처리 중에 Redis 로 PUBLISH 할 메시지를 모아서 보내는 공용 publisher.
+
+    from app.utils.publisher import publish, broadcast_to_go
+    publish("chat_channel", json.dumps(payload))   # 버퍼에 넣고 바로 반환 (sync/async 어디서나)
+
+- 요청 쪽에서는 스레드 안전한 버퍼에 넣기만 한다 (Redis 왕복 없음).
+- lifespan 에서 시작한 run() 이 버퍼를 최대 redis_publish_batch_size 개씩 꺼내
+  공유 커넥션 풀의 파이프라인 한 번으로 보낸다.
+- 실패하면 지수 백오프로 redis_publish_max_retries 번까지 다시 보내고,
+  그래도 안 되거나 버퍼가 가득 차면 dead-letter 에 보관한다 (요청은 실패시키지 않음).
+  requeue_dead_letters() 로 다시 보낼 수 있다.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from redis import RedisError
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.metrics import (
+    REDIS_PUBLISH_DEAD_LETTERS, REDIS_PUBLISH_FAILURES, REDIS_PUBLISH_LATENCY, REDIS_PUBLISH_RETRIES,
+    register_collector,
+)
+
+GO_CHANNEL = "chat_channel"
+_RETRY_BACKOFF = 0.1  # 첫 재시도 대기 (초), 시도마다 두 배
+
+logger = get_logger(__name__)
+
+# (channel, message, 시도 횟수)
+Entry = Tuple[str, str, int]
+
+
+class RedisPublisher:
+    def __init__(self, buffer_size: int, batch_size: int, max_retries: int, dead_letter_size: int):
+        self.buffer_size = buffer_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self._buffer: Deque[Entry] = deque()
+        self._lock = threading.Lock()
+        self.dead_letters: Deque[Tuple[str, str, str]] = deque(maxlen=dead_letter_size)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ------------------------------
+    # 요청 쪽
+    # ------------------------------
+    def publish(self, channel: str, message: str):
+        """버퍼에 넣고 바로 반환 (redis_url 이 비어 있으면 아무것도 하지 않음)"""
+        if not settings.redis_url:
+            return
+        with self._lock:
+            if len(self._buffer) >= self.buffer_size:
+                self._dead_letter(channel, message, "overflow")
+                return
+            self._buffer.append((channel, message, 0))
+        self._wake()
+
+    def _wake(self):
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return  # run() 이 시작되면 쌓인 것부터 보낸다
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        else:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                pass  # 루프가 이미 닫힘 (종료 중)
+
+    def _dead_letter(self, channel: str, message: str, reason: str):
+        self.dead_letters.append((channel, message, reason))
+        REDIS_PUBLISH_DEAD_LETTERS.inc(reason=reason)
+        logger.error("Redis PUBLISH dead-letter", extra={"channel": channel, "reason": reason})
+
+    def requeue_dead_letters(self) -> int:
+        """dead-letter 를 버퍼 뒤에 다시 넣는다 (넣은 개수)"""
+        requeued = 0
+        with self._lock:
+            while self.dead_letters and len(self._buffer) < self.buffer_size:
+                channel, message, _ = self.dead_letters.popleft()
+                self._buffer.append((channel, message, 0))
+                requeued += 1
+        self._wake()
+        return requeued
+
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    # ------------------------------
+    # 백그라운드 전송
+    # ------------------------------
+    def _take_batch(self) -> List[Entry]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def _retry_later(self, batch: List[Entry]):
+        retry = []
+        for channel, message, attempts in batch:
+            if attempts + 1 > self.max_retries:
+                self._dead_letter(channel, message, "retries_exhausted")
+            else:
+                retry.append((channel, message, attempts + 1))
+        with self._lock:
+            # 순서를 지키도록 버퍼 앞쪽에 되돌린다
+            self._buffer.extendleft(reversed(retry))
+        REDIS_PUBLISH_RETRIES.inc(len(retry))
+        return max((attempts for _, _, attempts in retry), default=0)
+
+    async def _send(self, client: aioredis.Redis, batch: List[Entry]) -> bool:
+        started = time.perf_counter()
+        try:
+            pipe = client.pipeline(transaction=False)
+            for channel, message, _ in batch:
+                pipe.publish(channel, message)
+            await pipe.execute()
+            return True
+        except (RedisError, OSError) as e:
+            for channel, _, _ in batch:
+                REDIS_PUBLISH_FAILURES.inc(channel=channel)
+            logger.warning("Redis PUBLISH 실패, 재시도 예정", extra={"count": len(batch), "error": str(e)})
+            return False
+        finally:
+            elapsed = time.perf_counter() - started
+            for channel in {channel for channel, _, _ in batch}:
+                REDIS_PUBLISH_LATENCY.observe(elapsed, channel=channel)
+
+    async def _flush(self, client: aioredis.Redis):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                return
+            if not await self._send(client, batch):
+                attempts = self._retry_later(batch)
+                if attempts:
+                    await asyncio.sleep(_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+    async def run(self):
+        """lifespan 동안 실행: 버퍼를 비우는 루프"""
+        if not settings.redis_url:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        pool = aioredis.ConnectionPool.from_url(
+            settings.redis_url, max_connections=settings.redis_publish_pool_size, decode_responses=True
+        )
+        client = aioredis.Redis(connection_pool=pool)
+        try:
+            while True:
+                await self._flush(client)
+                await self._wakeup.wait()
+                self._wakeup.clear()
+        finally:
+            self._loop = self._wakeup = None
+            # 종료 직전에 남은 것을 한 번 더 보낸다 (실패하면 dead-letter 로)
+            try:
+                await asyncio.wait_for(self._flush(client), timeout=2.0)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+            await client.aclose()
+            await pool.disconnect()
+
+
+publisher = RedisPublisher(
+    buffer_size=settings.redis_publish_buffer_size,
+    batch_size=settings.redis_publish_batch_size,
+    max_retries=settings.redis_publish_max_retries,
+    dead_letter_size=settings.redis_publish_dead_letter_size,
+)
+
+
+def publish(channel: str, message: str):
+    publisher.publish(channel, message)
+
+
+def broadcast_to_go(user: str, message: str):
+    """Go 실시간 서버가 구독하는 chat_channel 로 전달"""
+    publish(GO_CHANNEL, json.dumps({"user": user, "msg": message}))
+
+
+@register_collector
+def _publisher_families():
+    yield ("redis_publish_buffered", "gauge", "전송 대기 중인 PUBLISH 수", [({}, publisher.pending())])
+    yield ("redis_publish_dead_letter_size", "gauge", "dead-letter 에 보관 중인 PUBLISH 수",
+           [({}, len(publisher.dead_letters))])
@@ -0,0 +1,194 @@
+# app/utils/query_stats.py
+"""
+요청별 DB 쿼리 계측.
+
+SQLAlchemy 커서 실행 이벤트로 요청마다 실행한 SQL 문 수와 DB 시간을 모으고,
+같은 모양(파라미터만 다른 같은 SQL)의 쿼리가 query_repeat_threshold 번 이상 반복되면
+N+1 의심으로 표시한다.
+
+- 개발 (query_stats_headers=True): X-DB-Query-Count / X-DB-Query-Time-Ms / X-DB-Repeated-Queries 헤더
+- 운영: 라우트별 누적값을 route_query_metrics() 로 노출 (/metrics/db-queries)
+- 테스트: with query_budget(5): client.get(...) 로 엔드포인트별 쿼리 수 상한을 검사
+
+수집기는 ContextVar 에 쌓아 두므로 요청(또는 query_budget 블록)은 자기 컨텍스트에서 실행한 쿼리만 센다.
+요청 컨텍스트는 바깥 컨텍스트의 수집기를 물려받으므로, query_budget 블록 안에서 보낸 요청의 쿼리는
+그 budget 에도 잡히고 동시에 처리 중인 다른 요청의 쿼리는 잡히지 않는다.
+"""
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.metrics import DB_STATEMENT_LATENCY, register_collector
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+REPEATED_QUERIES_HEADER = "X-DB-Repeated-Queries"
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        with self._lock:
+            self.count += 1
+            self.seconds += seconds
+            self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        """threshold 번 이상 반복된 쿼리 모양 → 횟수"""
+        return {shape: n for shape, n in self.shapes.items() if n >= threshold}
+
+
+# 현재 컨텍스트의 수집기들 (바깥 query_budget → 요청 순)
+_active_stats: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def _collecting(stats: QueryStats) -> Iterator[QueryStats]:
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started_at"].pop()
+    elapsed = time.perf_counter() - started
+    DB_STATEMENT_LATENCY.observe(elapsed, engine=getattr(conn.engine.pool, "pool_name", "default"))
+    for stats in _active_stats.get():
+        stats.record(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+class _RouteTotals:
+    def __init__(self):
+        self.requests = 0
+        self.statements = 0
+        self.statements_max = 0
+        self.seconds = 0.0
+        self.repeated_requests = 0  # N+1 의심 요청 수
+
+
+_route_totals: Dict[str, _RouteTotals] = {}
+_route_lock = threading.Lock()
+
+
+def _record_route(route: str, stats: QueryStats, repeated: Dict[str, int]):
+    with _route_lock:
+        totals = _route_totals.setdefault(route, _RouteTotals())
+        totals.requests += 1
+        totals.statements += stats.count
+        totals.statements_max = max(totals.statements_max, stats.count)
+        totals.seconds += stats.seconds
+        if repeated:
+            totals.repeated_requests += 1
+
+
+def route_query_metrics() -> List[dict]:
+    with _route_lock:
+        return [
+            {
+                "route": route,
+                "requests": totals.requests,
+                "statements_total": totals.statements,
+                "statements_max": totals.statements_max,
+                "db_seconds_total": round(totals.seconds, 6),
+                "repeated_query_requests": totals.repeated_requests,
+            }
+            for route, totals in sorted(_route_totals.items())
+        ]
+
+
+@register_collector
+def _route_query_families():
+    rows = route_query_metrics()
+    yield ("db_request_statements_total", "counter", "라우트별 요청에서 실행한 SQL 문 수",
+           [({"route": row["route"]}, row["statements_total"]) for row in rows])
+    yield ("db_request_seconds_total", "counter", "라우트별 요청의 DB 시간 합계",
+           [({"route": row["route"]}, row["db_seconds_total"]) for row in rows])
+    yield ("db_repeated_query_requests_total", "counter", "같은 모양의 쿼리가 반복된 (N+1 의심) 요청 수",
+           [({"route": row["route"]}, row["repeated_query_requests"]) for row in rows])
+
+
+class QueryStatsMiddleware:
+    """요청마다 QueryStats 를 열고, 응답 시작 시 헤더/라우트별 누적값에 반영하는 ASGI 미들웨어"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                repeated = stats.repeated(settings.query_repeat_threshold)
+                route = scope.get("route")
+                _record_route(getattr(route, "path", "unmatched"), stats, repeated)
+                if repeated:
+                    for shape, n in repeated.items():
+                        logger.warning("N+1 의심 쿼리", extra={
+                            "method": scope["method"], "path": scope["path"], "repeats": n, "statement": shape[:200],
+                        })
+                if settings.query_stats_headers:
+                    headers = list(message.get("headers", []))
+                    headers.append((QUERY_COUNT_HEADER.encode(), str(stats.count).encode()))
+                    headers.append((QUERY_TIME_HEADER.encode(), f"{stats.seconds * 1000:.1f}".encode()))
+                    headers.append((REPEATED_QUERIES_HEADER.encode(), str(len(repeated)).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        with _collecting(stats):
+            await self.app(scope, receive, send_with_stats)
+
+
+@contextmanager
+def query_budget(max_statements: int, allow_repeated: bool = False):
+    """
+    블록 안에서 실행된 SQL 문이 max_statements 를 넘거나 (allow_repeated=False 일 때)
+    같은 모양의 쿼리가 query_repeat_threshold 번 이상 반복되면 AssertionError.
+
+        with query_budget(3):
+            client.get("/feed/home", headers=auth)
+    """
+    with _collecting(QueryStats()) as stats:
+        yield stats
+
+    problems = []
+    if stats.count > max_statements:
+        problems.append(f"{stats.count} statements (budget {max_statements})")
+    if not allow_repeated:
+        for shape, n in stats.repeated(settings.query_repeat_threshold).items():
+            problems.append(f"repeated {n}x: {shape[:200]}")
+    if problems:
+        raise AssertionError("query budget exceeded:\n  " + "\n  ".join(problems))
@@ -1,6 +1,28 @@
-from redis import Redis
+import time
 
-redis_client = Redis(host="localhost", port=6379, decode_responses=True)
+from redis import Redis, RedisError
 
-def publish_to_redis(channel: str, message: str):
-    redis_client.publish(channel, message)
\ No newline at end of file
+from app.config import settings
+
+redis_client = Redis.from_url(settings.redis_url or "redis://localhost:6379/0", decode_responses=True)
+
+# Redis 연결 가능 여부는 잠깐 캐시해서 매 요청마다 ping 하지 않도록 함
+_AVAILABILITY_TTL = 30.0
+_availability = {"ok": False, "checked_at": None}
+
+def redis_available() -> bool:
+    """Redis 를 쓸 수 있는지 확인 (redis_url 이 비어 있거나 연결이 안 되면 False)"""
+    if not settings.redis_url:
+        return False
+
+    now = time.monotonic()
+    checked_at = _availability["checked_at"]
+    if checked_at is not None and now - checked_at < _AVAILABILITY_TTL:
+        return _availability["ok"]
+
+    try:
+        _availability["ok"] = bool(redis_client.ping())
+    except RedisError:
+        _availability["ok"] = False
+    _availability["checked_at"] = now
+    return _availability["ok"]
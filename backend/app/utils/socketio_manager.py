@@ -0,0 +1,47 @@
+# app/utils/socketio_manager.py
+"""
+Socket.IO 클라이언트 매니저 선택.
+
+워커가 여러 개면 방(user_{id}, 채팅방) 멤버십이 워커마다 따로 있으므로,
+sio.emit(..., room=...) 을 pub/sub 채널로 모든 워커에 전파해야 한다.
+
+- redis_url 이 있으면 AsyncRedisManager (워커 간 전파)
+- 비어 있으면 MemoryPubSubManager: 같은 프로세스 안의 서버끼리만 공유하는 대체 구현.
+  단일 워커 개발 환경과, 한 프로세스에 서버 여러 개를 띄우는 테스트/벤치마크용이다.
+"""
+import asyncio
+from typing import Dict, List
+
+from socketio import AsyncRedisManager
+from socketio.async_pubsub_manager import AsyncPubSubManager
+
+from app.config import settings
+
+
+class MemoryPubSubManager(AsyncPubSubManager):
+    """프로세스 내 큐로 pub/sub 을 흉내 내는 매니저 (같은 channel 을 쓰는 서버끼리 전파)"""
+    name = "asyncmemory"
+
+    # channel -> 구독 중인 매니저들의 큐
+    _subscribers: Dict[str, List[asyncio.Queue]] = {}
+
+    async def _publish(self, data):
+        for queue in self._subscribers.get(self.channel, []):
+            queue.put_nowait(data)
+
+    async def _listen(self):
+        queue = asyncio.Queue()
+        subscribers = self._subscribers.setdefault(self.channel, [])
+        subscribers.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            subscribers.remove(queue)
+
+
+def create_client_manager(write_only: bool = False) -> AsyncPubSubManager:
+    """설정에 맞는 pub/sub 매니저 (write_only=True 면 emit 만 하고 구독하지 않음)"""
+    if settings.redis_url:
+        return AsyncRedisManager(settings.redis_url, channel=settings.socketio_channel, write_only=write_only)
+    return MemoryPubSubManager(channel=settings.socketio_channel, write_only=write_only)
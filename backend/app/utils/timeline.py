@@ -0,0 +1,198 @@
+# app/utils/timeline.py
+"""
+팔로우한 사람들의 게시글로 만든 사용자별 홈 타임라인.
+
+게시글이 작성되면 작성자의 팔로워마다 크기가 제한된 정렬 구조(Redis sorted set,
+score = post id)에 post id 를 넣어 둔다 (fan-out-on-write).
+팔로워가 timeline_fanout_threshold 이상인 작성자는 쓰기 폭주를 막기 위해
+fan-out 하지 않고, 읽을 때 해당 작성자의 최신 글을 합쳐서 보여준다 (fan-out-on-read).
+
+타임라인은 DB 에서 한 번 채운 뒤에만 준비된 것으로 표시한다 (timeline:ready:{user_id}).
+표시가 없으면 (기능 도입 직후, Redis 초기화 등) 읽을 때 DB 에서 채운다 - fan-out 으로 먼저 들어온
+글 몇 개 때문에 비어 있지 않더라도 마찬가지. 새로 팔로우하면 상대의 최근 글을 합쳐 넣는다.
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Set
+
+from redis import RedisError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Post
+from app.utils.follow_graph import follow_graph
+from app.utils.redis import redis_client, redis_available
+from app.utils.log import get_logger
+
+logger = get_logger(__name__)
+
+TIMELINE_KEY = "timeline:{user_id}"
+TIMELINE_READY_KEY = "timeline:ready:{user_id}"
+PULL_AUTHORS_KEY = "timeline:pull_authors"
+
+
+class RedisTimelineStore:
+    def __init__(self, client, max_len: int):
+        self.client = client
+        self.max_len = max_len
+
+    def push(self, user_ids: Iterable[int], post_id: int):
+        pipe = self.client.pipeline(transaction=False)
+        for user_id in user_ids:
+            key = TIMELINE_KEY.format(user_id=user_id)
+            pipe.zadd(key, {post_id: post_id})
+            # 오래된 항목부터 잘라서 최대 길이 유지
+            pipe.zremrangebyrank(key, 0, -(self.max_len + 1))
+        pipe.execute()
+
+    def merge(self, user_id: int, post_ids: List[int], mark_ready: bool = False):
+        """post id 들을 합쳐 넣는다 (그 사이 fan-out 으로 들어온 항목은 그대로 둠)"""
+        key = TIMELINE_KEY.format(user_id=user_id)
+        pipe = self.client.pipeline()
+        if post_ids:
+            pipe.zadd(key, {post_id: post_id for post_id in post_ids[:self.max_len]})
+            pipe.zremrangebyrank(key, 0, -(self.max_len + 1))
+        if mark_ready:
+            pipe.set(TIMELINE_READY_KEY.format(user_id=user_id), 1)
+        pipe.execute()
+
+    def is_ready(self, user_id: int) -> bool:
+        return bool(self.client.exists(TIMELINE_READY_KEY.format(user_id=user_id)))
+
+    def page(self, user_id: int, before: Optional[int], limit: int) -> List[int]:
+        key = TIMELINE_KEY.format(user_id=user_id)
+        upper = f"({before}" if before is not None else "+inf"
+        return [int(v) for v in self.client.zrevrangebyscore(key, upper, "-inf", start=0, num=limit)]
+
+    def add_pull_author(self, author_id: int):
+        self.client.sadd(PULL_AUTHORS_KEY, author_id)
+
+    def pull_authors(self) -> Set[int]:
+        return {int(v) for v in self.client.smembers(PULL_AUTHORS_KEY)}
+
+
+class MemoryTimelineStore:
+    """Redis 가 없을 때 쓰는 프로세스 내 대체 저장소 (워커 간 공유되지 않음)"""
+
+    def __init__(self, max_len: int):
+        self.max_len = max_len
+        self._timelines: Dict[int, List[int]] = {}  # 오름차순 post id
+        self._ready: Set[int] = set()
+        self._pull_authors: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def push(self, user_ids: Iterable[int], post_id: int):
+        with self._lock:
+            for user_id in user_ids:
+                timeline = self._timelines.setdefault(user_id, [])
+                index = bisect_left(timeline, post_id)
+                if index < len(timeline) and timeline[index] == post_id:
+                    continue
+                insort(timeline, post_id)
+                if len(timeline) > self.max_len:
+                    del timeline[:len(timeline) - self.max_len]
+
+    def merge(self, user_id: int, post_ids: List[int], mark_ready: bool = False):
+        with self._lock:
+            timeline = sorted(set(self._timelines.get(user_id, [])).union(post_ids[:self.max_len]))
+            self._timelines[user_id] = timeline[-self.max_len:]
+            if mark_ready:
+                self._ready.add(user_id)
+
+    def is_ready(self, user_id: int) -> bool:
+        with self._lock:
+            return user_id in self._ready
+
+    def page(self, user_id: int, before: Optional[int], limit: int) -> List[int]:
+        with self._lock:
+            timeline = self._timelines.get(user_id, [])
+            end = bisect_left(timeline, before) if before is not None else len(timeline)
+            return timeline[max(0, end - limit):end][::-1]
+
+    def add_pull_author(self, author_id: int):
+        with self._lock:
+            self._pull_authors.add(author_id)
+
+    def pull_authors(self) -> Set[int]:
+        with self._lock:
+            return set(self._pull_authors)
+
+
+_memory_store = MemoryTimelineStore(settings.timeline_max_len)
+_redis_store = RedisTimelineStore(redis_client, settings.timeline_max_len)
+
+
+def get_timeline_store():
+    return _redis_store if redis_available() else _memory_store
+
+
+def get_followee_ids(db: Session, user_id: int) -> List[int]:
+    return list(follow_graph.following(db, user_id))
+
+
+def fan_out_post(db: Session, post: Post):
+    """새 게시글 id 를 작성자와 팔로워들의 타임라인에 넣는다"""
+    store = get_timeline_store()
+    followers = follow_graph.followers(db, post.user_id)
+
+    try:
+        if len(followers) >= settings.timeline_fanout_threshold:
+            # 팔로워가 많은 계정은 읽을 때 합친다
+            store.add_pull_author(post.user_id)
+            store.push([post.user_id], post.id)
+            return
+
+        store.push([post.user_id, *followers], post.id)
+    except RedisError as e:
+        # 타임라인은 읽을 때 DB 에서 다시 만들 수 있으므로 게시글 작성은 실패시키지 않음
+        logger.error("타임라인 fan-out 실패", extra={"post_id": post.id, "error": str(e)})
+
+
+def _recent_post_ids(db: Session, author_ids: List[int]) -> List[int]:
+    return [
+        row[0] for row in db.query(Post.id)
+        .filter(Post.user_id.in_(author_ids))
+        .order_by(Post.id.desc())
+        .limit(settings.timeline_max_len)
+        .all()
+    ]
+
+
+def rebuild_timeline(db: Session, user_id: int, followee_ids: List[int]):
+    """준비 표시가 없는 타임라인 (신규 기능 도입, Redis 초기화 등) 을 DB 에서 채우고 표시한다"""
+    get_timeline_store().merge(user_id, _recent_post_ids(db, [user_id, *followee_ids]), mark_ready=True)
+
+
+def backfill_followee(db: Session, follower_id: int, followee_id: int):
+    """새로 팔로우한 사람의 최근 글을 팔로워 타임라인에 합친다 (아직 준비 전이면 읽을 때 어차피 채워짐)"""
+    store = get_timeline_store()
+    try:
+        if store.is_ready(follower_id):
+            store.merge(follower_id, _recent_post_ids(db, [followee_id]))
+    except RedisError as e:
+        logger.error("팔로우 타임라인 backfill 실패", extra={
+            "follower_id": follower_id, "followee_id": followee_id, "error": str(e),
+        })
+
+
+def read_timeline(db: Session, user_id: int, followee_ids: List[int], before: Optional[int], limit: int) -> List[int]:
+    """타임라인에서 before 보다 오래된 post id 를 최신순으로 최대 limit 개 반환"""
+    store = get_timeline_store()
+    try:
+        if not store.is_ready(user_id):
+            rebuild_timeline(db, user_id, followee_ids)
+        post_ids = store.page(user_id, before, limit)
+        pull_authors = store.pull_authors().intersection(followee_ids)
+    except RedisError as e:
+        logger.error("타임라인 조회 실패, DB 로 대체", extra={"user_id": user_id, "error": str(e)})
+        post_ids, pull_authors = [], {user_id, *followee_ids}
+
+    if pull_authors:
+        # fan-out-on-read 대상 작성자의 글은 여기서 합친다
+        pulled = db.query(Post.id).filter(Post.user_id.in_(pull_authors))
+        if before is not None:
+            pulled = pulled.filter(Post.id < before)
+        pulled_ids = [row[0] for row in pulled.order_by(Post.id.desc()).limit(limit).all()]
+        post_ids = sorted(set(post_ids).union(pulled_ids), reverse=True)[:limit]
+
+    return post_ids
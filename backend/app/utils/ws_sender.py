@@ -0,0 +1,142 @@
+# app/utils/ws_sender.py
+"""
+WebSocket 연결마다 송신 큐 + 전용 writer 태스크를 두는 래퍼.
+
+    client = QueuedWebSocket(websocket, endpoint="/ws/comments")
+    client.start()
+    client.send(json.dumps(data))      # 큐에 넣고 바로 반환 (기다리지 않음)
+    broadcast(clients, data)           # JSON 인코딩은 한 번만
+    await client.close()               # 핸들러가 끝날 때
+
+- 브로드캐스트하는 쪽은 큐에 넣기만 하므로 느린 클라이언트 하나가 다른 구독자나 요청을 막지 않는다.
+- 큐(ws_send_queue_size)가 가득 차면 ws_slow_client_policy 에 따라
+  drop_oldest: 가장 오래된 메시지를 버리고 넣는다 (ws_max_dropped 번 연속 버리면 연결 종료)
+  disconnect:  바로 연결을 끊는다
+- 메시지 하나 보내는 데 ws_send_timeout 초를 넘기면 연결을 끊는다.
+- 끊을 때는 1013 (Try Again Later) 으로 닫으므로, 핸들러의 receive 루프가 WebSocketDisconnect 로 빠져나간다.
+"""
+import asyncio
+import json
+import weakref
+from typing import Dict, Iterable, Optional
+
+from fastapi import WebSocket
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.metrics import WEBSOCKET_SEND_DROPPED, WEBSOCKET_SLOW_DISCONNECTS, register_collector
+
+CLOSE_TRY_AGAIN_LATER = 1013
+
+logger = get_logger(__name__)
+
+# /metrics 용: 살아 있는 연결 전체
+_clients: "weakref.WeakSet[QueuedWebSocket]" = weakref.WeakSet()
+
+
+class QueuedWebSocket:
+    def __init__(self, websocket: WebSocket, endpoint: str,
+                 queue_size: Optional[int] = None, policy: Optional[str] = None):
+        self.websocket = websocket
+        self.endpoint = endpoint
+        self.policy = policy or settings.ws_slow_client_policy
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size or settings.ws_send_queue_size)
+        self.closed = False
+        self._dropped_in_row = 0
+        self._writer: Optional[asyncio.Task] = None
+        self._closer: Optional[asyncio.Task] = None
+        _clients.add(self)
+
+    # ------------------------------
+    # 보내는 쪽
+    # ------------------------------
+    def send(self, text: str) -> bool:
+        """송신 큐에 넣는다 (버렸거나 이미 끊긴 연결이면 False)"""
+        if self.closed:
+            return False
+        if self.queue.full():
+            if self.policy == "disconnect":
+                self.disconnect("queue_full")
+                return False
+            self.queue.get_nowait()
+            WEBSOCKET_SEND_DROPPED.inc(endpoint=self.endpoint, reason="queue_full")
+            self._dropped_in_row += 1
+            if self._dropped_in_row >= settings.ws_max_dropped:
+                self.disconnect("too_many_dropped")
+                return False
+        self.queue.put_nowait(text)
+        return True
+
+    # ------------------------------
+    # writer 태스크
+    # ------------------------------
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self):
+        while True:
+            text = await self.queue.get()
+            try:
+                await asyncio.wait_for(self.websocket.send_text(text), settings.ws_send_timeout)
+            except asyncio.TimeoutError:
+                self.disconnect("send_timeout")
+                return
+            except Exception as e:
+                # 클라이언트가 이미 나감: receive 루프가 정리한다
+                self.closed = True
+                logger.debug("WebSocket 전송 실패", extra={
+                    "category": "websocket", "endpoint": self.endpoint, "error": str(e),
+                })
+                return
+            self._dropped_in_row = 0
+
+    def disconnect(self, reason: str):
+        """느린 클라이언트 연결을 끊는다 (기다리지 않음)"""
+        if self.closed:
+            return
+        self.closed = True
+        dropped = self.queue.qsize()
+        WEBSOCKET_SLOW_DISCONNECTS.inc(endpoint=self.endpoint, reason=reason)
+        if dropped:
+            WEBSOCKET_SEND_DROPPED.inc(dropped, endpoint=self.endpoint, reason="disconnected")
+        logger.warning("느린 WebSocket 클라이언트 연결 종료", extra={
+            "endpoint": self.endpoint, "reason": reason, "pending": dropped,
+        })
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+        self._closer = asyncio.create_task(self._close_socket())
+
+    async def _close_socket(self):
+        try:
+            await asyncio.wait_for(
+                self.websocket.close(code=CLOSE_TRY_AGAIN_LATER), settings.ws_send_timeout
+            )
+        except Exception:
+            pass  # 이미 닫혔거나 닫기 프레임도 못 보냄
+
+    async def close(self):
+        """핸들러 종료 시 호출: writer 를 멈추고 남은 메시지는 버린다"""
+        self.closed = True
+        _clients.discard(self)
+        tasks = [task for task in (self._writer, self._closer) if task is not None]
+        if self._writer is not None:
+            self._writer.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def broadcast(clients: Iterable[QueuedWebSocket], data: dict) -> int:
+    """모든 클라이언트 큐에 넣는다 (넣은 수, 기다리지 않음)"""
+    text = json.dumps(data)
+    return sum(1 for client in list(clients) if client.send(text))
+
+
+@register_collector
+def _send_queue_families():
+    depths: Dict[str, list] = {}
+    for client in list(_clients):
+        depths.setdefault(client.endpoint, []).append(client.queue.qsize())
+    yield ("websocket_send_queued", "gauge", "WebSocket 송신 큐에 쌓인 메시지 합계",
+           [({"endpoint": endpoint}, sum(values)) for endpoint, values in depths.items()])
+    yield ("websocket_send_queue_max", "gauge", "가장 밀린 WebSocket 연결의 송신 큐 길이",
+           [({"endpoint": endpoint}, max(values)) for endpoint, values in depths.items()])
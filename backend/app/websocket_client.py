@@ -1,23 +1,183 @@
+# app/websocket_client.py
+"""
+Go 실시간 서버로 가는 WebSocket 클라이언트 (워커마다 하나, 앱 수명 동안 연결 유지).
+
+    go_client.enqueue({"room": "chatroom-1", "content": "..."})  # 큐에 넣고 바로 반환
+
+- go_ws_connections 개의 연결이 하나의 송신 큐를 나눠서 비운다.
+- 큐에 쌓인 메시지를 최대 go_ws_batch_size 개씩 꺼내 이어서 보낸다.
+- 끊기면 지수 백오프로 다시 연결하고, 보내지 못한 메시지는 큐로 되돌린다.
+- 큐가 가득 차면 (Go 서버가 느리면) enqueue 가 False 를 돌려주고 메시지는 버린다.
+- 연결은 처음 보낼 메시지가 생길 때 연다 (Go 서버가 없는 개발 환경에서 재연결 로그가 쌓이지 않게).
+"""
 import asyncio
-import websockets
 import json
-from typing import Dict
+from typing import Dict, List, Optional
+
+import websockets
+from websockets.exceptions import WebSocketException
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.metrics import (
+    GO_WS_CONNECTED, GO_WS_DROPPED, GO_WS_RECONNECTS, GO_WS_SENT, register_collector,
+)
+
+_BACKOFF_INITIAL = 0.5  # 첫 재연결 대기 (초), 실패할 때마다 두 배
+
+logger = get_logger(__name__)
+
+
+def go_ws_url() -> str:
+    if not settings.go_ws_token:
+        return settings.go_ws_url
+    separator = "&" if "?" in settings.go_ws_url else "?"
+    return f"{settings.go_ws_url}{separator}token={settings.go_ws_token}"
+
+
+class GoRealtimeClient:
+    def __init__(self, connections: int, queue_size: int, batch_size: int):
+        self.connections = connections
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
 
-GO_WS_URL = "ws://localhost:8082/ws?token=YOUR_JWT_HERE"  # 실서비스에선 https
+    # ------------------------------
+    # 요청 쪽
+    # ------------------------------
+    def enqueue(self, data: Dict) -> bool:
+        """송신 큐에 넣는다 (큐가 가득 차면 버리고 False)"""
+        try:
+            self.queue.put_nowait(json.dumps(data))
+        except asyncio.QueueFull:
+            GO_WS_DROPPED.inc(reason="queue_full")
+            return False
+        return True
 
-async def send_message_to_go_server(data: Dict):
-    async with websockets.connect(GO_WS_URL) as websocket:
-        await websocket.send(json.dumps(data))
-        print("✅ 메시지 전송 완료")
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "connections": self.connections,
+            "connected": int(GO_WS_CONNECTED.value()),
+            "sent": int(GO_WS_SENT.value()),
+            "dropped": {reason: int(GO_WS_DROPPED.value(reason=reason)) for reason in ("queue_full", "send_failed")},
+            "reconnects": int(GO_WS_RECONNECTS.value()),
+        }
+
+    # ------------------------------
+    # 백그라운드 연결
+    # ------------------------------
+    def start(self):
+        if self._tasks:
+            return
+        # 이전 이벤트 루프에서 만든 큐일 수 있으므로 현재 루프용 큐로 옮겨 담는다
+        previous, self.queue = self.queue, asyncio.Queue(maxsize=self.queue.maxsize)
+        while not previous.empty():
+            self.queue.put_nowait(previous.get_nowait())
+        self._tasks = [asyncio.create_task(self._run_connection(i)) for i in range(self.connections)]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _next_batch(self) -> List[str]:
+        """메시지가 올 때까지 기다렸다가, 이미 쌓인 것까지 최대 batch_size 개"""
+        batch = [await self.queue.get()]
+        while len(batch) < self.batch_size and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    def _requeue(self, batch: List[str]):
+        for frame in batch:
+            try:
+                self.queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                GO_WS_DROPPED.inc(reason="send_failed")
+
+    async def _drain_replies(self, websocket):
+        # Go 서버 응답은 쓰지 않지만 읽어 줘야 수신 버퍼가 차지 않는다
+        try:
+            async for reply in websocket:
+                logger.debug("Go 서버 응답 수신", extra={"category": "broadcast", "size": len(reply)})
+        except WebSocketException:
+            pass  # 끊김은 송신 쪽에서 처리
+
+    async def _run_connection(self, index: int):
+        backoff = _BACKOFF_INITIAL
+        pending: List[str] = []
+        while True:
+            if not pending:
+                pending = await self._next_batch()
+            websocket = None
+            reader: Optional[asyncio.Task] = None
+            try:
+                websocket = await websockets.connect(go_ws_url(), open_timeout=settings.go_ws_connect_timeout)
+                GO_WS_CONNECTED.inc()
+                logger.info("Go 서버 연결", extra={"connection": index})
+                reader = asyncio.create_task(self._drain_replies(websocket))
+                backoff = _BACKOFF_INITIAL
+                while True:
+                    for i, frame in enumerate(pending):
+                        try:
+                            # send 는 쓰기 버퍼가 가득 차면 기다린다 (Go 서버가 느리면 큐가 차고 enqueue 가 거절)
+                            await websocket.send(frame)
+                        except BaseException:
+                            pending = pending[i:]
+                            raise
+                    GO_WS_SENT.inc(len(pending))
+                    pending = await self._next_batch()
+            except asyncio.CancelledError:
+                self._requeue(pending)
+                raise
+            except (OSError, asyncio.TimeoutError, WebSocketException) as e:
+                GO_WS_RECONNECTS.inc()
+                logger.warning("Go 서버 연결 끊김, 재연결 대기", extra={
+                    "connection": index, "error": str(e), "backoff": backoff,
+                })
+            except Exception as e:
+                # 예상하지 못한 오류로 태스크가 죽으면 이 연결 몫의 송신이 영영 멈춘다
+                GO_WS_RECONNECTS.inc()
+                logger.exception("Go 서버 연결 예외, 재연결 대기", extra={
+                    "connection": index, "error": str(e), "backoff": backoff,
+                })
+                # 보내던 메시지는 큐로 되돌려 다른 연결이 먼저 보낼 수 있게 한다
+                self._requeue(pending)
+                pending = []
+            finally:
+                if reader is not None:
+                    reader.cancel()
+                if websocket is not None:
+                    GO_WS_CONNECTED.dec()
+                    try:
+                        await websocket.close()
+                    except Exception:
+                        pass  # 이미 끊긴 연결
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, settings.go_ws_reconnect_max)
+
+
+go_client = GoRealtimeClient(
+    connections=settings.go_ws_connections,
+    queue_size=settings.go_ws_queue_size,
+    batch_size=settings.go_ws_batch_size,
+)
+
+
+@register_collector
+def _go_client_families():
+    yield ("go_ws_queue_depth", "gauge", "Go 서버로 보낼 대기 메시지 수", [({}, go_client.queue.qsize())])
 
-        # 수신 테스트 (선택)
-        response = await websocket.recv()
-        print("📥 수신된 응답:", response)
 
 # 사용 예시 (테스트 목적)
 if __name__ == "__main__":
-    sample_data = {
-        "room": "chatroom-1",
-        "content": "FastAPI에서 보낸 메시지"
-    }
-    asyncio.run(send_message_to_go_server(sample_data))
+    async def _demo():
+        go_client.start()
+        go_client.enqueue({"room": "chatroom-1", "content": "FastAPI에서 보낸 메시지"})
+        await asyncio.sleep(1)
+        print(go_client.stats())
+        await go_client.close()
+
+    asyncio.run(_demo())
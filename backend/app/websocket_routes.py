@@ -2,13 +2,22 @@ from fastapi import WebSocket
 from fastapi.routing import APIRouter
 import json
 
+from app.utils.metrics import WEBSOCKET_CONNECTIONS
+from app.utils.log import get_logger
+from app.utils.ws_sender import QueuedWebSocket
+
+logger = get_logger(__name__)
+
 router = APIRouter()
-user_socket = {}  # ✅ 사용자별 연결 저장
+user_socket = {}  # ✅ 사용자별 연결 저장 (연결마다 송신 큐)
 
 @router.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    
+    WEBSOCKET_CONNECTIONS.inc(endpoint="/ws")
+    client = QueuedWebSocket(websocket, endpoint="/ws")
+    client.start()
+
     user_id = None
     try:
         while True:
@@ -17,13 +26,14 @@ async def websocket_endpoint(websocket: WebSocket):
 
             if message["type"] == "join":
                 user_id = message["userId"]
-                user_socket[user_id] = websocket
-                print(f"✅ 유저 {user_id} 연결됨")
+                user_socket[user_id] = client
+                logger.info("WebSocket 유저 연결", extra={"category": "websocket", "user_id": user_id})
 
             elif message["type"] == "typing":
                 receiver_id = message["receiverId"]
                 if receiver_id in user_socket:
-                    await user_socket[receiver_id].send_text(json.dumps({
+                    # 받는 쪽이 느려도 보내는 쪽 수신 루프는 기다리지 않는다
+                    user_socket[receiver_id].send(json.dumps({
                         "type": "typing",
                         "senderId": user_id
                     }))
@@ -31,8 +41,10 @@ async def websocket_endpoint(websocket: WebSocket):
                 # 메시지 처리 로직
                 pass
     except Exception as e:
-        print("❌ WebSocket error:", e)
+        logger.warning("WebSocket 오류", extra={"error": str(e)})
     finally:
-        if user_id and user_id in user_socket:
+        WEBSOCKET_CONNECTIONS.dec(endpoint="/ws")
+        await client.close()
+        if user_id and user_socket.get(user_id) is client:
             del user_socket[user_id]
-            print(f"🔌 유저 {user_id} 연결 해제됨")
\ No newline at end of file
+            logger.info("WebSocket 유저 연결 해제", extra={"category": "websocket", "user_id": user_id})
\ No newline at end of file
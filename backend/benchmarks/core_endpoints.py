@@ -0,0 +1,404 @@
+# benchmarks/core_endpoints.py
+"""
+핵심 API 부하 테스트 + 기준선 비교.
+
+    cd backend && python -m benchmarks.core_endpoints                  # 실행 후 baseline.json 과 비교
+    cd backend && python -m benchmarks.core_endpoints --save-baseline  # 이번 결과를 기준선으로 저장
+    cd backend && python -m benchmarks.core_endpoints --scale 2 --requests 500 --concurrency 20
+
+임시 SQLite 파일 DB 와 프로세스 내 Redis 대체 저장소(REDIS_URL 비움)로 FastAPI 앱을 띄우고,
+고정 seed 로 사용자/팔로우/게시글/댓글/메시지/무드 데이터를 채운 뒤
+httpx ASGITransport 로 앱을 직접 호출한다 (네트워크/uvicorn 비용 제외).
+
+시나리오마다 p50/p95/p99 지연, 처리량(req/s), 요청당 SQL 문 수 (X-DB-Query-Count 헤더)를
+출력한다. 기준선이 있으면 p95 가 --max-regression 비율 이상 늘거나 요청당 쿼리 수가
+늘어난 시나리오를 표시하고 종료 코드 1 로 끝낸다.
+지연 값은 기계마다 다르므로 기준선은 같은 기계에서 만든 것과 비교해야 한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+PASSWORD = "benchmark-password"
+QUERY_TOLERANCE = 0.5  # 요청당 쿼리 수가 이만큼 늘면 저하
+
+# scale=1 기준 데이터 양
+BASE_VOLUMES = {
+    "users": 500,
+    "follows_per_user": 30,
+    "posts": 5000,
+    "comments": 20000,
+    "messages": 20000,
+    "moods": 2000,
+}
+
+WORDS = ["산책", "커피", "운동", "독서", "요가", "여행", "음악", "영화", "요리", "일기", "바다", "하늘"]
+EMOJIS = ["😀", "😢", "😡", "😴", "🥰", "😎"]
+
+
+def _configure_env(db_path: str):
+    # app 을 import 하기 전에 설정해야 Settings / 엔진이 이 값을 쓴다
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ["REDIS_URL"] = ""  # 타임라인/좋아요/스토리 등은 프로세스 내 저장소 사용
+    os.environ["DB_REPLICA_URLS"] = ""
+    os.environ["QUERY_STATS_HEADERS"] = "true"  # 요청당 쿼리 수 헤더
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+# ------------------------------
+# 데이터 준비
+# ------------------------------
+@dataclass
+class Dataset:
+    user_ids: List[int]
+    emails: Dict[int, str]
+    follows: List[Tuple[int, int]]
+    message_pairs: List[Tuple[int, int]]
+    tokens: Dict[int, str] = field(default_factory=dict)
+
+
+def seed(scale: float, rng: random.Random) -> Dataset:
+    from sqlalchemy import insert
+
+    from app.auth.utils import create_access_token, hash_password
+    from app.database import SessionLocal
+    from app.models import Comment, Follow, Message, Mood, Post, User
+    from app.utils.conversations import rebuild_conversations
+    from app.utils.follow_counts import reconcile_follow_counts
+
+    volumes = {key: max(1, int(value * scale)) for key, value in BASE_VOLUMES.items()}
+    volumes["follows_per_user"] = BASE_VOLUMES["follows_per_user"]
+    n_users = volumes["users"]
+    base_time = datetime(2026, 1, 1)
+    hashed = hash_password(PASSWORD)  # bcrypt 는 한 번만
+
+    users = [
+        {
+            "id": i,
+            "nickname": f"user{i}",
+            "email": f"user{i}@bench-carering.com",
+            "password": hashed,
+            "about": f"{rng.choice(WORDS)} 좋아하는 사람",
+            "created_at": base_time,
+        }
+        for i in range(1, n_users + 1)
+    ]
+
+    follows = set()
+    for follower in range(1, n_users + 1):
+        # 인기 사용자 쪽으로 치우친 분포 (앞 번호일수록 팔로워가 많음)
+        for _ in range(volumes["follows_per_user"]):
+            following = min(int(rng.paretovariate(1.2)), n_users)
+            following = following if rng.random() < 0.5 else rng.randint(1, n_users)
+            if following != follower:
+                follows.add((follower, following))
+    follows = sorted(follows)
+
+    posts = [
+        {
+            "id": i,
+            "user_id": rng.randint(1, n_users),
+            "phrase": " ".join(rng.sample(WORDS, 3)),
+            "hashtags": f"#{rng.choice(WORDS)}",
+            "disclosure": "public",
+            "likes": 0,
+            "created_at": base_time + timedelta(minutes=i),
+        }
+        for i in range(1, volumes["posts"] + 1)
+    ]
+    comments = [
+        {
+            "content": rng.choice(WORDS),
+            "user_id": rng.randint(1, n_users),
+            "post_id": rng.randint(1, volumes["posts"]),
+            "created_at": base_time + timedelta(minutes=i),
+        }
+        for i in range(1, volumes["comments"] + 1)
+    ]
+
+    # 메시지는 팔로우 관계 일부에서 오가는 대화로 만든다
+    message_pairs = rng.sample(follows, min(len(follows), max(1, volumes["messages"] // 20)))
+    messages = []
+    for i in range(1, volumes["messages"] + 1):
+        sender, receiver = rng.choice(message_pairs)
+        if rng.random() < 0.5:
+            sender, receiver = receiver, sender
+        sent_at = base_time + timedelta(seconds=30 * i)
+        messages.append({
+            "sender_id": sender,
+            "receiver_id": receiver,
+            "content": " ".join(rng.sample(WORDS, 2)),
+            "timestamp": sent_at,
+            "created_at": sent_at,
+            "is_read": rng.random() < 0.8,
+        })
+
+    now = datetime.utcnow()
+    moods = [
+        {
+            "user_id": rng.randint(1, n_users),
+            "emoji": rng.choice(EMOJIS),
+            "memo": rng.choice(WORDS),
+            "created_at": now - timedelta(minutes=rng.randint(0, 48 * 60)),
+        }
+        for _ in range(volumes["moods"])
+    ]
+
+    db = SessionLocal()
+    try:
+        for model, rows in (
+            (User, users), (Follow, [{"follower_id": a, "following_id": b} for a, b in follows]),
+            (Post, posts), (Comment, comments), (Message, messages), (Mood, moods),
+        ):
+            db.execute(insert(model), rows)
+        rebuild_conversations(db)
+        reconcile_follow_counts(db)
+        db.commit()
+    finally:
+        db.close()
+
+    dataset = Dataset(
+        user_ids=[u["id"] for u in users],
+        emails={u["id"]: u["email"] for u in users},
+        follows=follows,
+        message_pairs=message_pairs,
+    )
+    dataset.tokens = {uid: create_access_token({"user_id": uid}) for uid in dataset.user_ids}
+    print(
+        f"🌱 seed: users={n_users} follows={len(follows)} posts={len(posts)} "
+        f"comments={len(comments)} messages={len(messages)} moods={len(moods)}"
+    )
+    return dataset
+
+
+# ------------------------------
+# 시나리오
+# ------------------------------
+Request = Tuple[str, str, dict]  # (method, url, httpx 요청 kwargs)
+
+
+def _auth(data: Dataset, user_id: int) -> dict:
+    return {"Authorization": f"Bearer {data.tokens[user_id]}"}
+
+
+def _posts(data: Dataset, rng: random.Random) -> Request:
+    return "GET", "/posts?limit=20", {}
+
+
+def _message_users(data: Dataset, rng: random.Random) -> Request:
+    user_id = rng.choice(data.message_pairs)[0]
+    return "GET", "/messages/users", {"headers": _auth(data, user_id)}
+
+
+def _chat(data: Dataset, rng: random.Random) -> Request:
+    user_id, other_id = rng.choice(data.message_pairs)
+    return "GET", f"/messages/chat/{other_id}?limit=50", {"headers": _auth(data, user_id)}
+
+
+def _follow_info(data: Dataset, rng: random.Random) -> Request:
+    user_id = rng.choice(data.user_ids)
+    return "GET", f"/follow/{rng.choice(data.user_ids)}", {"headers": _auth(data, user_id)}
+
+
+def _follow_toggle(data: Dataset, rng: random.Random) -> Request:
+    follower, following = rng.choice(data.follows)
+    return "POST", f"/follow/{following}", {"headers": _auth(data, follower)}
+
+
+def _mood_stories(data: Dataset, rng: random.Random) -> Request:
+    return "GET", "/mood/stories", {"headers": _auth(data, rng.choice(data.user_ids))}
+
+
+def _search(data: Dataset, rng: random.Random) -> Request:
+    return "GET", "/search", {"params": {"query": rng.choice(WORDS)}}
+
+
+def _login(data: Dataset, rng: random.Random) -> Request:
+    user_id = rng.choice(data.user_ids)
+    return "POST", "/auth/login", {"json": {"email": data.emails[user_id], "password": PASSWORD}}
+
+
+# (이름, 요청 생성 함수, --requests 대비 요청 비율) - 로그인은 bcrypt 비용 때문에 적게
+SCENARIOS: List[Tuple[str, Callable[[Dataset, random.Random], Request], float]] = [
+    ("GET /posts", _posts, 1.0),
+    ("GET /messages/users", _message_users, 1.0),
+    ("GET /messages/chat/{id}", _chat, 1.0),
+    ("GET /follow/{id}", _follow_info, 1.0),
+    ("POST /follow/{id}", _follow_toggle, 1.0),
+    ("GET /mood/stories", _mood_stories, 1.0),
+    ("GET /search", _search, 1.0),
+    ("POST /auth/login", _login, 0.2),
+]
+
+
+# ------------------------------
+# 실행 / 집계
+# ------------------------------
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+async def run_scenario(client, data: Dataset, make_request, requests: int, concurrency: int,
+                       warmup: int, rng: random.Random) -> dict:
+    from app.utils.query_stats import QUERY_COUNT_HEADER
+
+    planned = [make_request(data, rng) for _ in range(warmup + requests)]
+    for method, url, kwargs in planned[:warmup]:
+        await client.request(method, url, **kwargs)
+
+    latencies, queries = [], []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(method, url, kwargs):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+            if QUERY_COUNT_HEADER in response.headers:
+                queries.append(int(response.headers[QUERY_COUNT_HEADER]))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(*request) for request in planned[warmup:]))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+    }
+
+
+async def run_all(data: Dataset, args) -> Dict[str, dict]:
+    import httpx
+
+    from app.main import fastapi_app
+
+    results = {}
+    transport = httpx.ASGITransport(app=fastapi_app, raise_app_exceptions=False)
+    async with fastapi_app.router.lifespan_context(fastapi_app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for name, make_request, ratio in SCENARIOS:
+                if args.only and not any(key in name for key in args.only):
+                    continue
+                requests = max(1, int(args.requests * ratio))
+                rng = random.Random(f"{args.seed}:{name}")
+                results[name] = await run_scenario(
+                    client, data, make_request, requests, args.concurrency, args.warmup, rng
+                )
+                print(_format_row(name, results[name]))
+    return results
+
+
+def _format_row(name: str, row: dict) -> str:
+    qpr = "-" if row["queries_per_request"] is None else f"{row['queries_per_request']:.1f}"
+    return (
+        f"{name:<26} n={row['requests']:<5} err={row['errors']:<3} "
+        f"p50={row['p50_ms']:8.2f}ms p95={row['p95_ms']:8.2f}ms p99={row['p99_ms']:8.2f}ms "
+        f"{row['throughput_rps']:8.1f} req/s  queries/req={qpr}"
+    )
+
+
+def compare(results: Dict[str, dict], baseline: dict, max_regression: float) -> List[str]:
+    """기준선보다 나빠진 시나리오 설명 목록 (비어 있으면 통과)"""
+    regressions = []
+    print("\n📊 기준선 비교 (p95, queries/req)")
+    for name, row in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"{name:<26} (기준선 없음)")
+            continue
+        p95_delta = (row["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        line = f"{name:<26} p95 {base['p95_ms']:8.2f} → {row['p95_ms']:8.2f}ms ({p95_delta:+.0%})"
+        if row["queries_per_request"] is not None and base.get("queries_per_request") is not None:
+            line += f"  queries/req {base['queries_per_request']:.1f} → {row['queries_per_request']:.1f}"
+            # 캐시 적중 여부로 조금씩 흔들리므로 QUERY_TOLERANCE 이상 늘었을 때만 저하로 본다
+            if row["queries_per_request"] - base["queries_per_request"] >= QUERY_TOLERANCE:
+                regressions.append(f"{name}: 요청당 쿼리 수 증가")
+        if p95_delta > max_regression:
+            regressions.append(f"{name}: p95 {p95_delta:+.0%}")
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=1.0, help="데이터 양 배수 (BASE_VOLUMES 기준)")
+    parser.add_argument("--requests", type=int, default=300, help="시나리오당 측정 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10, help="측정 전에 버리는 요청 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="이름에 이 문자열이 들어간 시나리오만 실행")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준선으로 저장")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="허용하는 p95 증가 비율")
+    parser.add_argument("--db", help="SQLite 파일 경로 (기본: 임시 디렉터리, 실행마다 새로 만듦)")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory(prefix="carering-bench-")
+    db_path = args.db or os.path.join(workdir.name, "bench.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    _configure_env(db_path)
+
+    import app.main  # noqa: F401  (테이블 생성)
+
+    data = seed(args.scale, random.Random(args.seed))
+    results = asyncio.run(run_all(data, args))
+
+    report = {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform()},
+        "params": {
+            "scale": args.scale, "requests": args.requests, "concurrency": args.concurrency,
+            "warmup": args.warmup, "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+        print(f"\n💾 기준선 저장: {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("params") != report["params"]:
+            print(f"\n⚠️ 기준선과 실행 조건이 다릅니다: {baseline.get('params')} vs {report['params']}")
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print("\n❌ 성능 저하:\n  " + "\n  ".join(regressions))
+            exit_code = 1
+        else:
+            print("\n✅ 기준선 대비 성능 저하 없음")
+    else:
+        print(f"\nℹ️ 기준선이 없습니다. --save-baseline 으로 {args.baseline} 를 만드세요.")
+
+    workdir.cleanup()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
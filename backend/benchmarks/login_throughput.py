@@ -0,0 +1,68 @@
+# benchmarks/login_throughput.py
+"""
+로그인(bcrypt 검증) 동시 처리량 비교.
+
+    cd backend && python -m benchmarks.login_throughput --requests 200 --concurrency 50
+
+- inline: 예전 방식처럼 이벤트 루프에서 bcrypt 를 직접 호출
+- pool:   verify_password_async (전용 해싱 풀) 로 실행
+
+각 모드마다 처리량(req/s)과, 같은 루프에서 10ms 마다 깨어나는 heartbeat 의
+최대 지연을 출력한다. heartbeat 지연이 크면 다른 요청들이 그만큼 멈춰 있었다는 뜻이다.
+DB 없이 bcrypt 비용만 측정한다.
+"""
+import argparse
+import asyncio
+import time
+
+from app.auth.utils import hash_password, verify_password, verify_password_async
+
+PASSWORD = "benchmark-password"
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list):
+    interval = 0.01
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def _run(mode: str, hashed: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with semaphore:
+            if mode == "inline":
+                ok = verify_password(PASSWORD, hashed)
+            else:
+                ok = await verify_password_async(PASSWORD, hashed)
+            assert ok
+
+    stop = asyncio.Event()
+    lags = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+    max_lag_ms = max(lags) * 1000 if lags else elapsed * 1000
+    print(f"{mode:>6}: {requests / elapsed:8.1f} req/s  total {elapsed:6.2f}s  max loop lag {max_lag_ms:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD)
+    for mode in ("inline", "pool"):
+        asyncio.run(_run(mode, hashed, args.requests, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# benchmarks/socketio_fanout.py
+"""
+워커 여러 개에 흩어진 Socket.IO 방으로 emit 할 때의 처리량/전달 지연.
+
+    cd backend && python -m benchmarks.socketio_fanout                       # 한 프로세스, 서버 4개, 메모리 pub/sub
+    cd backend && python -m benchmarks.socketio_fanout --backend redis --redis-url redis://localhost:6379/0
+
+- memory: 한 프로세스에 AsyncServer 를 --workers 개 띄우고 MemoryPubSubManager 로 연결
+          (pub/sub 경로 자체의 비용, 네트워크 없음)
+- redis:  워커마다 별도 프로세스 + AsyncRedisManager, emit 은 write_only 매니저가 보낸다
+          (uvicorn --workers 로 띄운 것과 같은 구성)
+
+방마다 --members 명이 워커들에 고르게 나뉘어 접속해 있다고 보고 (가짜 클라이언트),
+--emits 번 무작위 방으로 emit 한 뒤 모든 워커에 전달될 때까지 걸린 시간을 잰다.
+실제 소켓 전송 대신 전달 횟수만 센다.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from typing import List
+
+from benchmarks.core_endpoints import percentile
+
+NAMESPACE = "/"
+
+
+def _room_members(rooms: int, members: int, workers: int, worker: int) -> List[str]:
+    """이 워커에 접속한 가짜 클라이언트들의 방 목록 (방마다 members 명을 워커에 순서대로 배치)"""
+    return [
+        f"user_{room}"
+        for room in range(rooms)
+        for member in range(members)
+        if (room * members + member) % workers == worker
+    ]
+
+
+class _Receiver:
+    """AsyncServer 하나에 가짜 클라이언트를 붙이고 전달 횟수/지연을 센다"""
+
+    def __init__(self, server):
+        self.server = server
+        self.latencies = []
+        self.done = asyncio.Event()
+        self.expected = 0
+        self.eio_sids = set()
+        server._send_eio_packet = self._send_eio_packet
+
+    async def attach(self, rooms: List[str]):
+        for i, room in enumerate(rooms):
+            eio_sid = f"{id(self)}-{i}"
+            sid = await self.server.manager.connect(eio_sid, NAMESPACE)
+            await self.server.manager.enter_room(sid, NAMESPACE, room, eio_sid=eio_sid)
+
+    async def _send_eio_packet(self, eio_sid, eio_pkt):
+        # 패킷 내용: 42["message",{"sent_at": ...}]
+        sent_at = float(eio_pkt.data.split('"sent_at":', 1)[1].split("}", 1)[0])
+        self.latencies.append(time.time() - sent_at)
+        if len(self.latencies) >= self.expected:
+            self.done.set()
+
+
+def _report(backend: str, args, elapsed: float, latencies: List[float], delivered: int, expected: int):
+    latencies.sort()
+    print(
+        f"{backend:>6}: workers={args.workers} emits={args.emits} delivered={delivered}/{expected}  "
+        f"{args.emits / elapsed:9.1f} emits/s  {delivered / elapsed:9.1f} deliveries/s  "
+        f"p50={percentile(latencies, 50) * 1000:7.2f}ms p95={percentile(latencies, 95) * 1000:7.2f}ms "
+        f"p99={percentile(latencies, 99) * 1000:7.2f}ms"
+    )
+
+
+# ------------------------------
+# memory: 한 프로세스에 서버 여러 개
+# ------------------------------
+async def _run_memory(args):
+    from socketio import AsyncServer
+
+    from app.utils.socketio_manager import MemoryPubSubManager
+
+    channel = f"bench-{time.time_ns()}"
+    receivers = []
+    for worker in range(args.workers):
+        server = AsyncServer(async_mode="asgi", client_manager=MemoryPubSubManager(channel=channel))
+        receiver = _Receiver(server)
+        await receiver.attach(_room_members(args.rooms, args.members, args.workers, worker))
+        server.manager.initialize()
+        receivers.append(receiver)
+    await asyncio.sleep(0.05)  # 구독 태스크가 큐를 등록할 때까지
+
+    rng = random.Random(args.seed)
+    targets = [f"user_{rng.randrange(args.rooms)}" for _ in range(args.emits)]
+    expected_total = 0
+    for worker, receiver in enumerate(receivers):
+        members = _room_members(args.rooms, args.members, args.workers, worker)
+        receiver.expected = sum(members.count(room) for room in targets)
+        expected_total += receiver.expected
+        if receiver.expected == 0:
+            receiver.done.set()
+
+    emitter = receivers[0].server
+    started = time.perf_counter()
+    for room in targets:
+        await emitter.emit("message", {"sent_at": time.time()}, room=room)
+    try:
+        await asyncio.wait_for(asyncio.gather(*(r.done.wait() for r in receivers)), args.timeout)
+    except asyncio.TimeoutError:
+        print("⚠️ 시간 초과: 일부 메시지가 전달되지 않았습니다.")
+    elapsed = time.perf_counter() - started
+
+    latencies = [lat for r in receivers for lat in r.latencies]
+    _report("memory", args, elapsed, latencies, len(latencies), expected_total)
+    for receiver in receivers:
+        receiver.server.manager.thread.cancel()
+
+
+# ------------------------------
+# redis: 워커마다 프로세스
+# ------------------------------
+def _redis_worker(worker: int, args, channel: str, targets: List[str], ready, results):
+    async def run():
+        from socketio import AsyncRedisManager, AsyncServer
+
+        server = AsyncServer(async_mode="asgi", client_manager=AsyncRedisManager(args.redis_url, channel=channel))
+        receiver = _Receiver(server)
+        members = _room_members(args.rooms, args.members, args.workers, worker)
+        await receiver.attach(members)
+        receiver.expected = sum(members.count(room) for room in targets)
+        if receiver.expected == 0:
+            receiver.done.set()
+        server.manager.initialize()
+        await asyncio.sleep(0.5)  # SUBSCRIBE 완료 대기
+        ready.set()
+        try:
+            await asyncio.wait_for(receiver.done.wait(), args.timeout)
+        except asyncio.TimeoutError:
+            pass
+        results.put((receiver.expected, receiver.latencies))
+
+    asyncio.run(run())
+
+
+async def _emit_redis(args, channel: str, targets: List[str]):
+    from socketio import AsyncRedisManager
+
+    manager = AsyncRedisManager(args.redis_url, channel=channel, write_only=True)
+    for room in targets:
+        await manager.emit("message", {"sent_at": time.time()}, namespace=NAMESPACE, room=room)
+
+
+def _run_redis(args):
+    channel = f"bench-{time.time_ns()}"
+    rng = random.Random(args.seed)
+    targets = [f"user_{rng.randrange(args.rooms)}" for _ in range(args.emits)]
+
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    events = [ctx.Event() for _ in range(args.workers)]
+    processes = [
+        ctx.Process(target=_redis_worker, args=(worker, args, channel, targets, events[worker], results))
+        for worker in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for event in events:
+        event.wait(args.timeout)
+
+    started = time.perf_counter()
+    asyncio.run(_emit_redis(args, channel, targets))
+    collected = [results.get(timeout=args.timeout + 5) for _ in processes]
+    elapsed = time.perf_counter() - started
+    for process in processes:
+        process.join()
+
+    expected_total = sum(expected for expected, _ in collected)
+    latencies = [lat for _, lats in collected for lat in lats]
+    _report("redis", args, elapsed, latencies, len(latencies), expected_total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("memory", "redis"), default="memory")
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rooms", type=int, default=1000, help="user_{id} 방 수")
+    parser.add_argument("--members", type=int, default=2, help="방마다 접속한 클라이언트 수 (워커에 나뉨)")
+    parser.add_argument("--emits", type=int, default=5000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.backend == "memory":
+        asyncio.run(_run_memory(args))
+    else:
+        _run_redis(args)
+
+
+if __name__ == "__main__":
+    main()
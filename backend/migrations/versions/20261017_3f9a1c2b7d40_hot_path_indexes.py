@@ -0,0 +1,67 @@
+"""hot path indexes
+
+자주 조회하는 조건에 맞춘 보조 인덱스와 follows 중복 방지 unique 인덱스.
+기존 DB 는 main.py 의 create_all 로 만들어졌기 때문에 이미 있는 인덱스는 건너뛴다.
+
+follows 에 중복 행이 있으면 가장 먼저 생긴 행만 남기고 지운다. 지운 행이 있으면
+python -m app.commands.reconcile_follow_counts 로 팔로우 수를 다시 맞춘다.
+
+Revision ID: 3f9a1c2b7d40
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "3f9a1c2b7d40"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (인덱스 이름, 테이블, 컬럼, unique)
+INDEXES = [
+    ("ix_messages_sender_receiver_timestamp", "messages", ["sender_id", "receiver_id", "timestamp"], False),
+    ("ix_messages_receiver_is_read", "messages", ["receiver_id", "is_read"], False),
+    ("unique_follow_pair", "follows", ["follower_id", "following_id"], True),
+    ("ix_follows_following_follower", "follows", ["following_id", "follower_id"], False),
+    ("ix_comments_post_created_at", "comments", ["post_id", "created_at"], False),
+    ("ix_moods_user_created_at", "moods", ["user_id", "created_at"], False),
+    ("ix_posts_user_created_at", "posts", ["user_id", "created_at"], False),
+    ("ix_medicines_date", "medicines", ["date"], False),
+]
+
+
+def _existing_indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    names = {index["name"] for index in inspector.get_indexes(table)}
+    names.update(constraint["name"] for constraint in inspector.get_unique_constraints(table))
+    return names
+
+
+def _remove_duplicate_follows():
+    # MySQL 은 DELETE 대상 테이블을 서브쿼리에서 직접 읽을 수 없어서 파생 테이블로 한 번 감싼다
+    result = op.get_bind().execute(sa.text(
+        "DELETE FROM follows WHERE id NOT IN ("
+        " SELECT keep_id FROM ("
+        "  SELECT MIN(id) AS keep_id FROM follows GROUP BY follower_id, following_id"
+        " ) AS keep"
+        ")"
+    ))
+    if result.rowcount:
+        print(f"⚠️ 중복 팔로우 {result.rowcount}건 삭제 - python -m app.commands.reconcile_follow_counts 를 실행하세요")
+
+
+def upgrade():
+    for name, table, columns, unique in INDEXES:
+        if name in _existing_indexes(table):
+            continue
+        if table == "follows" and unique:
+            _remove_duplicate_follows()
+        op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade():
+    for name, table, columns, unique in reversed(INDEXES):
+        if name in _existing_indexes(table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,40 @@
+"""post likes
+
+사용자별 게시글 좋아요 기록 (같은 사용자가 두 번 좋아요하지 않도록 unique).
+기존 좋아요는 posts.likes 숫자로만 남아 있어서 옮길 행이 없다.
+
+Revision ID: 8b2e5d1f6a93
+Revises: 3f9a1c2b7d40
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "8b2e5d1f6a93"
+down_revision = "3f9a1c2b7d40"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(name):
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    # create_all 로 만든 DB 에는 이미 있다
+    if _has_table("post_likes"):
+        return
+    op.create_table(
+        "post_likes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id"), nullable=False),
+        sa.UniqueConstraint("user_id", "post_id", name="unique_user_post_like"),
+    )
+    op.create_index("ix_post_likes_id", "post_likes", ["id"])
+
+
+def downgrade():
+    if _has_table("post_likes"):
+        op.drop_table("post_likes")
@@ -0,0 +1,69 @@
+"""conversations
+
+두 사용자 간 대화방과 마지막 메시지 / 안 읽은 수 (받은편지함용 비정규화).
+테이블을 새로 만든 경우에만 기존 messages 로 채운다.
+나중에 다시 맞추려면 python -m app.commands.backfill_conversations 를 실행한다.
+
+Revision ID: c4d7a2e9b158
+Revises: 8b2e5d1f6a93
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "c4d7a2e9b158"
+down_revision = "8b2e5d1f6a93"
+branch_labels = None
+depends_on = None
+
+# 대화방마다 (작은 id, 큰 id) 한 행: 마지막 메시지와 각 참여자의 안 읽은 수
+BACKFILL = """
+INSERT INTO conversations
+    (user_low_id, user_high_id, last_message_id, last_message_at, unread_count_low, unread_count_high)
+SELECT pairs.user_low_id, pairs.user_high_id, pairs.last_message_id, m.timestamp,
+       pairs.unread_count_low, pairs.unread_count_high
+FROM (
+    SELECT
+        CASE WHEN sender_id <= receiver_id THEN sender_id ELSE receiver_id END AS user_low_id,
+        CASE WHEN sender_id <= receiver_id THEN receiver_id ELSE sender_id END AS user_high_id,
+        MAX(id) AS last_message_id,
+        SUM(CASE WHEN is_read = 0 AND receiver_id <= sender_id THEN 1 ELSE 0 END) AS unread_count_low,
+        SUM(CASE WHEN is_read = 0 AND receiver_id > sender_id THEN 1 ELSE 0 END) AS unread_count_high
+    FROM messages
+    GROUP BY
+        CASE WHEN sender_id <= receiver_id THEN sender_id ELSE receiver_id END,
+        CASE WHEN sender_id <= receiver_id THEN receiver_id ELSE sender_id END
+) AS pairs
+JOIN messages m ON m.id = pairs.last_message_id
+"""
+
+
+def _has_table(name):
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    # create_all 로 만든 DB 에는 이미 있다 (앱이 메시지마다 갱신 중이므로 백필하지 않음)
+    if _has_table("conversations"):
+        return
+    op.create_table(
+        "conversations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_low_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_high_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("last_message_id", sa.Integer(), sa.ForeignKey("messages.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("last_message_at", sa.DateTime(), nullable=True),
+        sa.Column("unread_count_low", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("unread_count_high", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.UniqueConstraint("user_low_id", "user_high_id", name="unique_conversation_pair"),
+    )
+    op.create_index("ix_conversations_id", "conversations", ["id"])
+    op.create_index("ix_conversations_low_last_message", "conversations", ["user_low_id", "last_message_at"])
+    op.create_index("ix_conversations_high_last_message", "conversations", ["user_high_id", "last_message_at"])
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    if _has_table("conversations"):
+        op.drop_table("conversations")
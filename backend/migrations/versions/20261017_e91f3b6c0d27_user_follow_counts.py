@@ -0,0 +1,48 @@
+"""user follow counts
+
+users.follower_count / following_count 를 추가하고 follows 테이블 기준으로 채운다.
+이후 값이 어긋나면 python -m app.commands.reconcile_follow_counts 로 다시 맞춘다.
+
+Revision ID: e91f3b6c0d27
+Revises: c4d7a2e9b158
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e91f3b6c0d27"
+down_revision = "c4d7a2e9b158"
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = ("follower_count", "following_count")
+
+BACKFILL = """
+UPDATE users SET
+    follower_count = (SELECT COUNT(*) FROM follows WHERE follows.following_id = users.id),
+    following_count = (SELECT COUNT(*) FROM follows WHERE follows.follower_id = users.id)
+"""
+
+
+def _existing_columns():
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns("users")}
+
+
+def upgrade():
+    existing = _existing_columns()
+    added = [name for name in COUNT_COLUMNS if name not in existing]
+    # create_all 로 만든 DB 에는 이미 있다 (toggle_follow 가 갱신 중이므로 백필하지 않음)
+    if not added:
+        return
+    for name in added:
+        op.add_column("users", sa.Column(name, sa.Integer(), nullable=False, server_default=sa.text("0")))
+    op.execute(BACKFILL)
+
+
+def downgrade():
+    existing = _existing_columns()
+    with op.batch_alter_table("users") as batch:
+        for name in COUNT_COLUMNS:
+            if name in existing:
+                batch.drop_column(name)
@@ -0,0 +1,34 @@
+# tests/conftest.py
+"""
+백엔드 테스트 공통 설정: 임시 SQLite 파일 DB, Redis 없이 실행.
+
+    cd backend && python -m pytest tests
+"""
+import os
+import tempfile
+
+# app.config 가 읽기 전에 설정 (engine 은 import 시점에 만들어짐)
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["ASYNC_DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["DB_REPLICA_URLS"] = ""
+os.environ["REDIS_URL"] = ""
+
+import pytest  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+import app.models  # noqa: E402,F401
+import app.models.medicines  # noqa: E402,F401
+import app.models.profile_customization  # noqa: E402,F401
+import app.models.widget_layout  # noqa: E402,F401
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+from app.utils.chat_subscriber import ChatRelay
+
+
+class FakeSio:
+    def __init__(self):
+        self.emitted = []
+
+    async def emit(self, event, data, room=None, ignore_queue=False):
+        self.emitted.append((event, data, room))
+
+
+def _relay(messages):
+    sio = FakeSio()
+    relay = ChatRelay(sio, max_inflight=4)
+
+    async def run():
+        for data in messages:
+            await relay.dispatch(data, time.time())
+        await relay.drain()
+
+    asyncio.run(run())
+    return sio.emitted
+
+
+def test_message_with_room_is_emitted_to_that_room():
+    emitted = _relay([{"room": "conv:1", "content": "hi"}])
+    assert emitted == [("message", {"room": "conv:1", "content": "hi"}, "conv:1")]
+
+
+def test_message_without_room_is_not_broadcast():
+    # broadcast_to_go 의 댓글 알림은 room 이 없다
+    assert _relay([{"user": "a", "msg": "댓글"}, {"room": None, "msg": "x"}]) == []
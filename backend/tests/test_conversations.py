@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from app.models import Conversation, Message, User
+from app.utils.conversations import record_message
+
+
+def _send(db, sender_id, receiver_id, timestamp):
+    message = Message(sender_id=sender_id, receiver_id=receiver_id, content="hi", timestamp=timestamp)
+    db.add(message)
+    db.flush()
+    record_message(db, message)
+    db.commit()
+    return message
+
+
+def _users(db):
+    db.add_all([
+        User(id=1, email="a@example.com", nickname="a", password="pw"),
+        User(id=2, email="b@example.com", nickname="b", password="pw"),
+    ])
+    db.commit()
+
+
+def test_last_message_moves_forward(db):
+    _users(db)
+    first_at = datetime(2026, 1, 1, 9, 0)
+    _send(db, 1, 2, first_at)
+    second = _send(db, 2, 1, first_at + timedelta(minutes=5))
+
+    conversation = db.query(Conversation).one()
+    db.refresh(conversation)
+    assert conversation.last_message_id == second.id
+    assert conversation.last_message_at == second.timestamp
+    assert (conversation.unread_count_low, conversation.unread_count_high) == (1, 1)
+
+
+def test_older_message_recorded_late_does_not_win(db):
+    _users(db)
+    at = datetime(2026, 1, 1, 9, 0)
+    older = Message(sender_id=1, receiver_id=2, content="a", timestamp=at)
+    newer = Message(sender_id=2, receiver_id=1, content="b", timestamp=at + timedelta(seconds=1))
+    db.add_all([older, newer])
+    db.flush()
+    # id 가 큰 메시지의 트랜잭션이 먼저 반영된 경우
+    record_message(db, newer)
+    record_message(db, older)
+    db.commit()
+
+    conversation = db.query(Conversation).one()
+    db.refresh(conversation)
+    assert conversation.last_message_id == newer.id
+    assert conversation.last_message_at == newer.timestamp
+    assert (conversation.unread_count_low, conversation.unread_count_high) == (1, 1)
+
+
+def test_last_message_at_follows_when_id_already_assigned(db):
+    # MySQL 은 SET 을 왼쪽부터 적용해서 last_message_at 의 CASE 가 새 last_message_id 를 본다
+    # → 그 상태(id 는 이미 새 메시지)에서도 시간이 갱신되어야 한다
+    _users(db)
+    first_at = datetime(2026, 1, 1, 9, 0)
+    _send(db, 1, 2, first_at)
+    second = Message(sender_id=2, receiver_id=1, content="b", timestamp=first_at + timedelta(minutes=5))
+    db.add(second)
+    db.flush()
+    db.query(Conversation).update({Conversation.last_message_id: second.id}, synchronize_session=False)
+    record_message(db, second)
+    db.commit()
+
+    conversation = db.query(Conversation).one()
+    db.refresh(conversation)
+    assert conversation.last_message_at == second.timestamp
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import create_engine
+
+from app.database import SessionLocal
+from app.models import Follow, User
+from app.utils.follow_graph import FollowGraph
+
+
+@pytest.fixture
+def lagging_replica_session(db):
+    # 테이블조차 없는 복제본: 여기로 읽으면 실패한다
+    replica = create_engine("sqlite://")
+    session = SessionLocal()
+    session.replicas = [replica]
+    session.info["use_replica"] = True
+    try:
+        yield session
+    finally:
+        session.close()
+        replica.dispose()
+
+
+def test_adjacency_is_loaded_from_primary(db, lagging_replica_session):
+    db.add_all([
+        User(id=1, email="a@example.com", nickname="a", password="pw"),
+        User(id=2, email="b@example.com", nickname="b", password="pw"),
+        Follow(follower_id=1, following_id=2),
+        Follow(follower_id=2, following_id=1),
+    ])
+    db.commit()
+
+    graph = FollowGraph(max_users=10)
+    assert list(graph.following(lagging_replica_session, 1)) == [2]
+    assert graph.mutual_ids(lagging_replica_session, 1) == [2]
@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.models import Post, User
+from app.utils import like_counter
+from app.utils.like_counter import MemoryLikeCounter, add_like, flush_like_counts
+
+
+@pytest.fixture(autouse=True)
+def fresh_counter(monkeypatch):
+    monkeypatch.setattr(like_counter, "_memory_counter", MemoryLikeCounter())
+
+
+def _post(db, likes):
+    db.add_all([
+        User(id=1, email="a@example.com", nickname="a", password="pw"),
+        Post(id=1, user_id=1, phrase="hi", likes=likes),
+    ])
+    db.commit()
+    return db.get(Post, 1)
+
+
+def _likes(db):
+    db.expire_all()
+    return db.scalar(select(Post.likes).where(Post.id == 1))
+
+
+def test_flush_adds_deltas_instead_of_overwriting(db):
+    post = _post(db, likes=5)
+    assert add_like(db, post, 1) == 6
+    assert add_like(db, post, 1) == 7
+    # 다른 워커의 flusher 가 먼저 자기 몫을 더한 상황
+    db.execute(update(Post).where(Post.id == 1).values(likes=Post.likes + 1))
+    db.commit()
+
+    assert flush_like_counts(100) == 1
+    assert _likes(db) == 8
+    # 꺼낸 delta 는 다시 더해지지 않는다
+    assert flush_like_counts(100) == 0
+    assert _likes(db) == 8
+
+
+def test_failed_flush_restores_deltas(db, monkeypatch):
+    post = _post(db, likes=0)
+    add_like(db, post, 1)
+
+    class BrokenSession:
+        def execute(self, *args, **kwargs):
+            raise RuntimeError("db down")
+
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    with monkeypatch.context() as m:
+        m.setattr(like_counter, "SessionLocal", BrokenSession)
+        with pytest.raises(RuntimeError):
+            flush_like_counts(100)
+
+    assert flush_like_counts(100) == 1
+    assert _likes(db) == 1
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, get_db
+from app.models import User
+from app.utils.query_stats import QueryStatsMiddleware, query_budget
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+
+    @app.get("/users")
+    def list_users(db: Session = Depends(get_db)):
+        # 일부러 N+1: 사용자마다 한 번씩 다시 조회
+        ids = db.scalars(select(User.id)).all()
+        return [db.scalar(select(User.nickname).where(User.id == uid)) for uid in ids]
+
+    return TestClient(app)
+
+
+def _users(db, n):
+    db.add_all([User(id=i, email=f"u{i}@example.com", nickname=f"u{i}", password="pw") for i in range(1, n + 1)])
+    db.commit()
+
+
+def test_budget_counts_statements_of_requests_made_inside_it(db):
+    _users(db, 2)
+    client = _client()
+
+    with query_budget(3) as stats:
+        assert client.get("/users").json() == ["u1", "u2"]
+    assert stats.count == 3
+
+    with pytest.raises(AssertionError, match="statements"):
+        with query_budget(2):
+            client.get("/users")
+
+
+def test_budget_flags_repeated_queries(db):
+    _users(db, 5)
+    with pytest.raises(AssertionError, match="repeated"):
+        with query_budget(100):
+            _client().get("/users")
+
+
+def test_budget_ignores_queries_from_other_contexts(db):
+    _users(db, 1)
+
+    def other_request():
+        session = SessionLocal()
+        try:
+            for _ in range(5):
+                session.scalar(select(User.id))
+        finally:
+            session.close()
+
+    with query_budget(1) as stats:
+        worker = threading.Thread(target=other_request)
+        worker.start()
+        worker.join()
+        db.scalar(select(User.nickname))
+    assert stats.count == 1
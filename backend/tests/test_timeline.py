@@ -0,0 +1,47 @@
+import pytest
+
+from app.config import settings
+from app.models import Follow, Post, User
+from app.utils import timeline
+from app.utils.follow_graph import follow_graph
+
+
+@pytest.fixture(autouse=True)
+def fresh_store(monkeypatch):
+    monkeypatch.setattr(timeline, "_memory_store", timeline.MemoryTimelineStore(settings.timeline_max_len))
+    follow_graph._following.clear()
+    follow_graph._followers.clear()
+
+
+def _setup(db):
+    db.add_all([
+        User(id=1, email="a@example.com", nickname="a", password="pw"),
+        User(id=2, email="b@example.com", nickname="b", password="pw"),
+        User(id=3, email="c@example.com", nickname="c", password="pw"),
+        Follow(follower_id=1, following_id=2),
+    ])
+    db.add_all([Post(id=i, user_id=2, phrase=f"old {i}") for i in (1, 2)])
+    db.add_all([Post(id=i, user_id=3, phrase=f"other {i}") for i in (3, 4)])
+    db.commit()
+
+
+def test_first_fan_out_does_not_hide_history(db):
+    # 배포 직후: 빈 타임라인에 fan-out 으로 글 하나만 들어온 상태
+    _setup(db)
+    post = Post(id=5, user_id=2, phrase="new")
+    db.add(post)
+    db.commit()
+    timeline.fan_out_post(db, post)
+
+    assert timeline.read_timeline(db, 1, [2], None, 10) == [5, 2, 1]
+
+
+def test_new_follow_backfills_followee_posts(db):
+    _setup(db)
+    assert timeline.read_timeline(db, 1, [2], None, 10) == [2, 1]
+
+    db.add(Follow(follower_id=1, following_id=3))
+    db.commit()
+    timeline.backfill_followee(db, 1, 3)
+
+    assert timeline.read_timeline(db, 1, [2, 3], None, 10) == [4, 3, 2, 1]
@@ -0,0 +1,51 @@
+import asyncio
+
+from app import websocket_client
+from app.websocket_client import GoRealtimeClient
+
+
+class FakeWebSocket:
+    def __init__(self, sent):
+        self.sent = sent
+
+    async def send(self, frame):
+        self.sent.append(frame)
+
+    async def close(self):
+        pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(3600)
+        raise StopAsyncIteration
+
+
+def test_unexpected_error_keeps_connection_loop_alive(monkeypatch):
+    sent = []
+    attempts = []
+
+    async def connect(url, open_timeout):
+        attempts.append(url)
+        if len(attempts) == 1:
+            raise RuntimeError("handshake bug")
+        return FakeWebSocket(sent)
+
+    monkeypatch.setattr(websocket_client.websockets, "connect", connect)
+    monkeypatch.setattr(websocket_client, "_BACKOFF_INITIAL", 0.01)
+
+    async def run():
+        client = GoRealtimeClient(connections=1, queue_size=10, batch_size=10)
+        client.start()
+        client.enqueue({"room": "r", "content": "1"})
+        client.enqueue({"room": "r", "content": "2"})
+        for _ in range(100):
+            if len(sent) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await client.close()
+
+    asyncio.run(run())
+    assert len(attempts) == 2
+    assert sent == ['{"room": "r", "content": "1"}', '{"room": "r", "content": "2"}']